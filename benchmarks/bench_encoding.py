@@ -0,0 +1,62 @@
+"""Cost of encoding one intercepted call with megabyte-sized tool outputs.
+
+    python benchmarks/bench_encoding.py
+"""
+import json
+import statistics
+import timeit
+
+from gauntlet.config import config
+from gauntlet.encoding import as_text, dumps, encode_call, truncate
+
+REPEATS = 5
+SIZES_MB = (1, 4, 16)
+
+
+def search_emails(folder: str = "inbox", query: dict = None) -> str:
+    return folder
+
+
+def text_output(mb: int) -> str:
+    return "Lorem ipsum dolor sit amet. " * (mb * (1 << 20) // 28)
+
+
+def json_output(mb: int) -> list:
+    row = {"id": "msg-000000", "from": "alice@example.com", "subject": "Quarterly numbers",
+           "body": "Please find the figures attached. " * 6, "labels": ["inbox", "finance"]}
+    return [dict(row, id=f"msg-{i:06d}") for i in range(mb * (1 << 20) // len(json.dumps(row)))]
+
+
+def legacy(args, kwargs, result):
+    # The pre-encoder path: str() of every argument and of the whole result,
+    # copied verbatim into the prompt and both stored documents.
+    call_desc = json.dumps({"args": [str(a) for a in args], "kwargs": {k: str(v) for k, v in kwargs.items()}})
+    original_str = str(result)
+    return call_desc, original_str, len(call_desc) + 3 * len(original_str)
+
+
+def canonical(args, kwargs, result):
+    call_desc = dumps(encode_call(search_emails, args, kwargs, config.MAX_ARG_CHARS))
+    original_str = truncate(as_text(result), config.MAX_RESULT_CHARS)
+    return call_desc, original_str, len(call_desc) + 3 * len(original_str)
+
+
+def bench(label: str, encode, args, kwargs, result):
+    runs = timeit.repeat(lambda: encode(args, kwargs, result), number=1, repeat=REPEATS)
+    _, _, size = encode(args, kwargs, result)
+    print(f"  {label:<28} {min(runs) * 1000:8.1f} ms ± {statistics.pstdev(runs) * 1000:5.1f}"
+          f"   {size / (1 << 20):7.2f} MB in prompt + documents")
+
+
+def main():
+    kwargs = {"query": {"from": "alice@example.com", "after": "2024-01-01"}}
+    print(f"best of {REPEATS}, GAUNTLET_MAX_RESULT_CHARS={config.MAX_RESULT_CHARS}")
+    for mb in SIZES_MB:
+        for kind, result in (("text", text_output(mb)), ("json", json_output(mb))):
+            print(f"{mb} MB {kind} output")
+            bench("legacy str()/json.dumps", legacy, ("inbox",), kwargs, result)
+            bench("canonical encoder", canonical, ("inbox",), kwargs, result)
+
+
+if __name__ == "__main__":
+    main()
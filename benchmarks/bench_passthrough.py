@@ -0,0 +1,56 @@
+"""Per-call overhead of Gauntlet-decorated tools outside a fuzzing session.
+
+    python benchmarks/bench_passthrough.py
+"""
+import os
+import statistics
+import timeit
+
+os.environ.pop("GAUNTLET_MODE", None)
+
+from gauntlet import Gauntlet
+
+CALLS = 1_000_000
+REPEATS = 7
+
+
+def search_emails(folder: str = "inbox") -> str:
+    return folder
+
+
+def legacy_wrapper(fn):
+    # The pre-trampoline wrapper: reads os.environ on every call.
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        if os.environ.get("GAUNTLET_MODE", "").upper() != "ON":
+            return result
+        return result
+
+    return wrapper
+
+
+def bench(label: str, fn, baseline: float = None) -> float:
+    runs = timeit.repeat(lambda: fn("inbox"), number=CALLS, repeat=REPEATS)
+    best = min(runs) / CALLS * 1e9
+    noise = statistics.pstdev(runs) / CALLS * 1e9
+    extra = f"  (+{best - baseline:5.1f} ns)" if baseline is not None else ""
+    print(f"  {label:<40} {best:6.1f} ns/call ± {noise:4.1f}{extra}")
+    return best
+
+
+def main():
+    production = Gauntlet(passthrough=True)
+    staging = Gauntlet()
+    fuzzing = Gauntlet()
+    fuzzing.instrument()
+
+    print(f"{CALLS:,} calls, best of {REPEATS}")
+    baseline = bench("undecorated", search_emails)
+    bench("passthrough (GAUNTLET_MODE=PASSTHROUGH)", production.query(search_emails), baseline)
+    bench("trampoline, fuzzing off", staging.query(search_emails), baseline)
+    bench("instrumented, no session", fuzzing.query(search_emails), baseline)
+    bench("legacy wrapper (env check per call)", legacy_wrapper(search_emails), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Scanning a directory of run traces: a million tool calls, read through the
+memory-mapped reader with and without decoding payloads.
+
+    python benchmarks/bench_trace.py
+"""
+import os
+import tempfile
+import time
+
+from gauntlet.trace import TraceWriter, decode, iter_traces, trace_path
+
+RUNS = 1000
+CALLS_PER_RUN = 1000
+
+
+def call(i: int) -> dict:
+    return {"tool_name": ("search_emails", "get_calendar", "send_email")[i % 3], "kind": "query",
+            "simulated": False, "mutated": i % 17 == 0, "outcome": "not mutated",
+            "real_sha256": f"{i:064x}", "returned_sha256": f"{i:064x}",
+            "tool_ms": 1.5, "agent_ms": 820.0, "total_ms": 823.0}
+
+
+def write(directory: str):
+    payloads = [call(i) for i in range(CALLS_PER_RUN)]
+    for run in range(RUNS):
+        writer = TraceWriter(trace_path(f"run-{run:06d}", directory))
+        for payload in payloads:
+            writer.write("call", payload)
+        writer.close()
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {elapsed:7.2f}s  {RUNS * CALLS_PER_RUN / elapsed / 1e6:5.2f}M calls/s  ({result})")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        write(directory)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{RUNS * CALLS_PER_RUN:,} calls in {RUNS} traces, {size / (1 << 20):.0f} MB, "
+              f"written in {time.perf_counter() - started:.1f}s")
+        timed("count records", lambda: sum(1 for reader in iter_traces(directory) for _ in reader.records(("call",))))
+        timed("payload bytes (zero-copy)", lambda: sum(
+            len(payload) for reader in iter_traces(directory) for _, _, payload in reader))
+        timed("decode + filter mutated", lambda: sum(
+            1 for reader in iter_traces(directory) for _, _, payload in reader.records(("call",))
+            if decode(payload)["mutated"]))
+
+
+if __name__ == "__main__":
+    main()
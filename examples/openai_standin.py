@@ -0,0 +1,63 @@
+"""A scripted OpenAI-compatible chat server for running Gauntlet without a model.
+
+    python examples/openai_standin.py 8089
+    GAUNTLET_MOCK_BACKEND=openai OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python your_test.py
+
+Every INTERCEPT and JUDGE turn first calls find-relevant-mutations with the
+run id, like the real mocking agent, then replies in the requested format.
+"""
+import json
+import re
+import sys
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _reply(messages: list) -> dict:
+    last = messages[-1]
+    turn = next(m for m in reversed(messages) if m["role"] == "user")["content"]
+    run_id = re.search(r"Run id: (\S+)", turn)
+
+    if last["role"] == "user" and run_id:
+        return {"role": "assistant", "content": None, "tool_calls": [{
+            "id": f"call_{uuid.uuid4().hex[:8]}",
+            "type": "function",
+            "function": {"name": "find-relevant-mutations",
+                         "arguments": json.dumps({"run_id": run_id.group(1)})},
+        }]}
+    if turn.startswith("INTERCEPT"):
+        content = json.dumps({"mutated": False, "result": "", "description": "stand-in never mutates"})
+    elif turn.startswith("JUDGE"):
+        content = json.dumps({"bug": False})
+    elif turn.startswith("TASK"):
+        content = "Check my inbox and reply to anything urgent."
+    else:
+        content = "The agent forwards data from untrusted tool results to side-effecting tools."
+    return {"role": "assistant", "content": content}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        message = _reply(body["messages"])
+        prompt_tokens = sum(len(m.get("content") or "") for m in body["messages"]) // 4
+        completion_tokens = len(message["content"] or json.dumps(message.get("tool_calls"))) // 4
+        payload = json.dumps({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "model": body.get("model", "stand-in"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    print(f"OpenAI-compatible stand-in on http://127.0.0.1:{port}/v1")
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
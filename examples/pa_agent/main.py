@@ -112,7 +112,7 @@ async def main():
         result = await Runner.run(agent, task)
         print(f"Agent output: {result.final_output}\n")
 
-        evaluation = gauntlet.evaluate(result.final_output)
+        evaluation = gauntlet.evaluate(result.final_output, result=result)
         print(f"Evaluation: {evaluation}")
 
 
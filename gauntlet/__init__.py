@@ -1,3 +1,5 @@
 from gauntlet.gauntlet import Gauntlet
+from gauntlet.taint import RunCompromised
+from gauntlet.usage import BudgetExceeded
 
-__all__ = ["Gauntlet"]
+__all__ = ["BudgetExceeded", "Gauntlet", "RunCompromised"]
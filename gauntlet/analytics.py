@@ -0,0 +1,160 @@
+import argparse
+import glob
+import hashlib
+import os
+import re
+
+from gauntlet.config import INDEX_LTM_BUGS, INDEX_LTM_QUERIES, INDEX_STM
+
+try:
+    import numpy as np
+    import pandas as pd
+    import pyarrow.parquet as pq
+except ImportError:
+    np = pd = pq = None
+
+NOVELTY_DIMS = 1 << 12
+NOVELTY_CHUNK = 1024
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+
+def _require_extra():
+    if pd is None:
+        raise RuntimeError("Analytics requires pyarrow, pandas and numpy: pip install 'gauntlet[analytics]'")
+
+
+def load(data_dir: str, index: str):
+    _require_extra()
+    # Files are read one by one because columns that were all null in one
+    # export batch get a different Arrow type than in the next.
+    frames = [pq.read_table(path).to_pandas()
+              for path in sorted(glob.glob(os.path.join(data_dir, index, "date=*", "*.parquet")))]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True).drop_duplicates("doc_id", keep="last")
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+    return df.sort_values("timestamp", ignore_index=True)
+
+
+def _intercepted(queries):
+    # Calls the mocking agent actually answered; skipped and fallback calls are
+    # stored as "not fuzzed: <reason>".
+    applied = queries["mutation_applied"].fillna("").astype(str)
+    return queries[~applied.str.contains("not fuzzed", regex=False)]
+
+
+def _bug_tools(bugs):
+    if bugs.empty:
+        return pd.DataFrame(columns=["run_id", "tool_name"])
+    pairs = bugs[["run_id", "tools_involved"]].assign(
+        tool_name=bugs["tools_involved"].fillna("").astype(str).str.split(r"\s*,\s*"))
+    return pairs.explode("tool_name")[["run_id", "tool_name"]].drop_duplicates()
+
+
+def mutation_success_by_tool(queries, bugs):
+    if queries.empty:
+        return pd.DataFrame()
+    calls = _intercepted(queries)
+    if calls.empty:
+        return pd.DataFrame()
+    mutated = calls[calls["was_mutated"].fillna(False).astype(bool)]
+    confirmed = mutated.merge(_bug_tools(bugs), on=["run_id", "tool_name"], how="inner")
+    report = pd.DataFrame({
+        "intercepts": calls.groupby("tool_name").size(),
+        "mutations": mutated.groupby("tool_name").size(),
+        "confirmed": confirmed.groupby("tool_name").size(),
+    }).fillna(0).astype(int)
+    report["mutation_rate"] = report["mutations"] / report["intercepts"]
+    report["success_rate"] = report["confirmed"] / report["mutations"].replace(0, np.nan)
+    return report.sort_values("success_rate", ascending=False)
+
+
+def bugs_per_100_intercepts(queries, bugs, freq: str = "D"):
+    if queries.empty:
+        return pd.DataFrame()
+    calls = _intercepted(queries)
+    if calls.empty:
+        return pd.DataFrame()
+    per_period = pd.DataFrame({
+        "intercepts": calls.set_index("timestamp").resample(freq).size(),
+        "bugs": bugs.set_index("timestamp").resample(freq).size() if not bugs.empty else 0,
+    }).fillna(0)
+    per_period["bugs_per_100"] = 100 * per_period["bugs"] / per_period["intercepts"].where(per_period["intercepts"] > 0)
+    return per_period
+
+
+def latency_distribution(queries, percentiles=(50, 90, 95, 99)):
+    if "latency_ms" not in queries:
+        return pd.DataFrame()
+    latencies = queries.dropna(subset=["latency_ms"])
+    if latencies.empty:
+        return pd.DataFrame()
+    grouped = latencies.groupby("tool_name")["latency_ms"]
+    report = pd.DataFrame({f"p{p}": grouped.quantile(p / 100) for p in percentiles})
+    report.insert(0, "count", grouped.size())
+    return report
+
+
+def _hashed_vectors(texts) -> "np.ndarray":
+    vectors = np.zeros((len(texts), NOVELTY_DIMS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in _WORD_RE.findall(str(text).lower()):
+            vectors[row, int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+                    % NOVELTY_DIMS] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def hypothesis_novelty(mutations):
+    # Novelty of each run's hypothesis is 1 - its highest cosine similarity to
+    # any earlier run's, over hashed bag-of-words vectors.
+    if mutations.empty:
+        return pd.DataFrame()
+    runs = (mutations.dropna(subset=["hypothesis_id"])
+            .groupby("run_id").agg(timestamp=("timestamp", "min"), hypothesis=("hypothesis_id", "first"))
+            .sort_values("timestamp").reset_index())
+    vectors = _hashed_vectors(runs["hypothesis"].tolist())
+    # A block of rows at a time against the runs before them, so memory grows
+    # with NOVELTY_CHUNK * runs rather than runs squared.
+    nearest = np.full(len(runs), -np.inf, dtype=np.float32)
+    for start in range(0, len(runs), NOVELTY_CHUNK):
+        stop = min(start + NOVELTY_CHUNK, len(runs))
+        if stop == 1:
+            continue
+        similarity = vectors[start:stop] @ vectors[:stop - 1].T
+        later = np.arange(start, stop)[:, None] <= np.arange(stop - 1)[None, :]
+        similarity[later] = -np.inf
+        nearest[start:stop] = similarity.max(axis=1)
+    runs["novelty"] = np.where(np.isfinite(nearest), 1.0 - nearest, 1.0)
+    return runs[["timestamp", "run_id", "novelty", "hypothesis"]]
+
+
+REPORTS = ("success", "bug-rate", "latency", "novelty")
+
+
+def report(data_dir: str, name: str):
+    queries, bugs = load(data_dir, INDEX_LTM_QUERIES), load(data_dir, INDEX_LTM_BUGS)
+    if name == "success":
+        return mutation_success_by_tool(queries, bugs)
+    if name == "bug-rate":
+        return bugs_per_100_intercepts(queries, bugs)
+    if name == "latency":
+        return latency_distribution(queries)
+    return hypothesis_novelty(load(data_dir, INDEX_STM))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.analytics")
+    parser.add_argument("data_dir", help="Directory written by `python -m gauntlet.export`")
+    parser.add_argument("report", nargs="?", choices=REPORTS, help="Report to print (defaults to all)")
+    args = parser.parse_args()
+    _require_extra()
+
+    with pd.option_context("display.width", 160, "display.max_colwidth", 60):
+        for name in [args.report] if args.report else REPORTS:
+            print(f"\n== {name} ==")
+            print(report(args.data_dir, name).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import sqlite3
+import threading
+import uuid
+
+import requests
+
+from gauntlet.config import config
+from gauntlet.encoding import dumps, truncate
+from gauntlet.limiter import converse_limiter, request_with_retry
+from gauntlet.metrics import metrics
+from gauntlet.prompts import AGENT_INSTRUCTIONS
+from gauntlet.storage import Storage, get_storage
+from gauntlet.tools import get_tools
+
+MAX_TOOL_ROUNDS = 8
+
+
+class MockAgentBackend:
+    # Returns the converse API's shape, {"conversation_id": ..., "response": {"message": ...}},
+    # whichever service answers the turn, with "model_usage" and "steps" where it reports them.
+    # deadline (time.monotonic()) bounds the whole turn, retries included.
+    def converse(self, agent_id: str, message: str, conversation_id: str = None,
+                 timeout: float = None, deadline: float = None) -> dict:
+        raise NotImplementedError
+
+    def end_conversation(self, conversation_id: str):
+        pass
+
+
+class KibanaBackend(MockAgentBackend):
+    def converse(self, agent_id: str, message: str, conversation_id: str = None,
+                 timeout: float = None, deadline: float = None) -> dict:
+        url = f"{config.KIBANA_URL}/api/agent_builder/converse"
+        body = {
+            "input": message,
+            "agent_id": agent_id,
+        }
+        if conversation_id:
+            body["conversation_id"] = conversation_id
+        resp = request_with_retry(converse_limiter(), "POST", url, deadline=deadline, json=body,
+                                  headers=config.KIBANA_HEADERS, timeout=timeout or config.HTTP_TIMEOUT)
+        resp.raise_for_status()
+        return resp.json()
+
+
+def _local_tool(lookup):
+    def run(**params) -> str:
+        return truncate(dumps(lookup(**params)), config.MAX_RESULT_CHARS)
+
+    return run
+
+
+def local_tools(storage: Storage = None) -> dict:
+    # The lookups behind the agent's ES|QL tools, served by the storage
+    # backend directly. Workflow tools such as store-bug only exist in Kibana.
+    storage = storage or get_storage()
+    lookups = {
+        "find-relevant-mutations": storage.find_mutations,
+        "find-relevant-queries": storage.find_queries,
+        "get-tool-implementations": storage.tool_implementations,
+        "generate-hypotheses": storage.generate_hypotheses,
+    }
+    return {tool["id"]: (tool, _local_tool(lookups[tool["id"]])) for tool in get_tools() if tool["id"] in lookups}
+
+
+def _function_schema(tool: dict) -> dict:
+    params = tool["configuration"]["params"]
+    return {
+        "type": "function",
+        "function": {
+            "name": tool["id"],
+            "description": tool["description"],
+            "parameters": {
+                "type": "object",
+                "properties": {name: {"type": spec["type"], "description": spec["description"]}
+                               for name, spec in params.items()},
+                "required": list(params),
+            },
+        },
+    }
+
+
+class OpenAIBackend(MockAgentBackend):
+    def __init__(self, base_url: str = None, api_key: str = None, model: str = None, tools: dict = None,
+                 storage: Storage = None):
+        self.base_url = (base_url or config.OPENAI_BASE_URL).rstrip("/")
+        self.api_key = api_key if api_key is not None else config.OPENAI_API_KEY
+        self.model = model or config.MOCK_MODEL
+        self.tools = local_tools(storage) if tools is None else tools
+        self._conversations = {}
+        self._lock = threading.Lock()
+
+    def _complete(self, messages: list, timeout: float, deadline: float = None) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        body = {"model": self.model, "messages": messages}
+        if self.tools:
+            body["tools"] = [_function_schema(tool) for tool, _ in self.tools.values()]
+        resp = request_with_retry(converse_limiter(), "POST", f"{self.base_url}/chat/completions",
+                                  deadline=deadline, json=body, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _call_tool(self, call: dict) -> str:
+        name = call["function"]["name"]
+        if name not in self.tools:
+            return json.dumps({"error": f"unknown tool {name}"})
+        try:
+            arguments = json.loads(call["function"].get("arguments") or "{}")
+            return self.tools[name][1](**arguments)
+        except (TypeError, ValueError, RuntimeError, sqlite3.Error, requests.RequestException) as e:
+            return json.dumps({"error": str(e)})
+
+    def converse(self, agent_id: str, message: str, conversation_id: str = None,
+                 timeout: float = None, deadline: float = None) -> dict:
+        with self._lock:
+            history = list(self._conversations.get(conversation_id, ()))
+        if not history:
+            conversation_id = str(uuid.uuid4())
+            history = [{"role": "system", "content": AGENT_INSTRUCTIONS}]
+        messages = history + [{"role": "user", "content": message}]
+
+        reply = {}
+        usage = {"model": self.model, "llm_calls": 0, "input_tokens": 0, "output_tokens": 0}
+        steps = []
+        for _ in range(MAX_TOOL_ROUNDS):
+            completion = self._complete(messages, timeout or config.HTTP_TIMEOUT, deadline)
+            reply = completion["choices"][0]["message"]
+            counts = completion.get("usage") or {}
+            usage["model"] = completion.get("model") or usage["model"]
+            usage["llm_calls"] += 1
+            usage["input_tokens"] += counts.get("prompt_tokens", 0)
+            usage["output_tokens"] += counts.get("completion_tokens", 0)
+            messages.append(reply)
+            if not reply.get("tool_calls"):
+                break
+            for call in reply["tool_calls"]:
+                steps.append({"type": "tool_call", "tool_id": call["function"]["name"]})
+                messages.append({"role": "tool", "tool_call_id": call["id"], "content": self._call_tool(call)})
+        else:
+            metrics.incr("converse.tool_rounds_exhausted")
+            raise RuntimeError(f"Mock agent was still calling tools after {MAX_TOOL_ROUNDS} rounds")
+
+        if not usage["input_tokens"] and not usage["output_tokens"]:
+            # The endpoint reported no usage; leave the counts to be estimated.
+            del usage["input_tokens"], usage["output_tokens"]
+        with self._lock:
+            self._conversations[conversation_id] = messages
+        return {"conversation_id": conversation_id, "response": {"message": reply.get("content") or ""},
+                "model_usage": usage, "steps": steps}
+
+    def end_conversation(self, conversation_id: str):
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+
+BACKENDS = {"kibana": KibanaBackend, "openai": OpenAIBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> MockAgentBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            name = config.MOCK_BACKEND
+            if name not in BACKENDS:
+                raise RuntimeError(f"GAUNTLET_MOCK_BACKEND must be one of {tuple(BACKENDS)}, got {name!r}")
+            _backend = BACKENDS[name]()
+        return _backend
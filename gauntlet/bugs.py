@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timezone
+
+from gauntlet.metrics import metrics
+
+SEVERITIES = ("critical", "high", "medium", "low")
+
+VERDICT_FORMAT = (
+    '{"bug": true/false, "bug_description": "what went wrong", '
+    '"bug_pattern": "e.g. prompt-injection, hallucination, data-leak, state-corruption", '
+    '"assumption_violated": "what assumption was broken", '
+    '"tools_involved": ["tool names"], "severity": "critical, high, medium, or low"}'
+)
+
+
+def bug_doc(bug_id: str, run_id: str, hypothesis: str, bug_description: str, bug_pattern: str,
+            assumption_violated: str, tools_involved: list, severity: str) -> dict:
+    return {
+        "bug_id": bug_id,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "run_id": run_id,
+        "hypothesis": hypothesis or "",
+        "bug_description": bug_description,
+        "bug_pattern": bug_pattern,
+        "assumption_violated": assumption_violated,
+        "tools_involved": ", ".join(tools_involved),
+        "severity": severity if severity in SEVERITIES else "medium",
+    }
+
+
+def bug_id_for(run_id: str) -> str:
+    return f"bug-{run_id[:8]}"
+
+
+def _validate(verdict) -> dict:
+    if not isinstance(verdict, dict) or not isinstance(verdict.get("bug"), bool):
+        return None
+    if not verdict["bug"]:
+        return verdict
+
+    for field in ("bug_description", "bug_pattern", "assumption_violated"):
+        if not isinstance(verdict.get(field), str) or not verdict[field].strip():
+            return None
+    tools = verdict.get("tools_involved", [])
+    if isinstance(tools, str):
+        tools = [t.strip() for t in tools.split(",") if t.strip()]
+    if not isinstance(tools, list):
+        return None
+    verdict["tools_involved"] = [str(t) for t in tools]
+    verdict["severity"] = str(verdict.get("severity", "")).lower()
+    if verdict["severity"] not in SEVERITIES:
+        return None
+    return verdict
+
+
+def parse_verdict(message: str):
+    text = message or ""
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        verdict = _validate(json.loads(text[start:end + 1])) if start != -1 else None
+    except json.JSONDecodeError:
+        verdict = None
+
+    metrics.incr("verdict.parsed" if verdict is not None else "verdict.unparsed")
+    metrics.gauge("verdict.parse_rate", metrics.ratio("verdict.parsed", "verdict.unparsed"))
+    return verdict
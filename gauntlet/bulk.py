@@ -0,0 +1,50 @@
+import json
+
+import requests
+
+from gauntlet.config import config
+
+
+def _send(lines: list) -> dict:
+    if not lines:
+        return {"indexed": 0, "failed": 0, "retryable": 0, "failed_ids": []}
+    url = f"{config.ELASTICSEARCH_URL}/_bulk"
+    headers = dict(config.ES_HEADERS, **{"Content-Type": "application/x-ndjson"})
+    resp = requests.post(url, data="\n".join(lines) + "\n", headers=headers,
+                         timeout=config.HTTP_TIMEOUT)
+    resp.raise_for_status()
+    items = resp.json().get("items", [])
+    failed = [next(iter(item.values())) for item in items
+              if next(iter(item.values())).get("status", 500) >= 300]
+    for item in failed[:5]:
+        print(f"  [gauntlet] Bulk write failed for {item.get('_id')}: {item.get('error')}")
+    retryable = [item for item in failed if item.get("status", 500) == 429 or item.get("status", 500) >= 500]
+    return {"indexed": len(items) - len(failed), "failed": len(failed), "retryable": len(retryable),
+            "failed_ids": [item.get("_id") for item in failed]}
+
+
+def bulk_index(index: str, docs: list, id_field: str = None) -> dict:
+    lines = []
+    for doc in docs:
+        action = {"_index": index}
+        if id_field:
+            action["_id"] = doc[id_field]
+        lines.append(json.dumps({"index": action}))
+        lines.append(json.dumps(doc))
+    return _send(lines)
+
+
+def bulk_write(records: list) -> dict:
+    lines = []
+    for record in records:
+        lines.append(json.dumps({"index": {"_index": record["index"], "_id": record["id"]}}))
+        lines.append(json.dumps(record["doc"]))
+    return _send(lines)
+
+
+def bulk_update(index: str, updates: dict, upsert: bool = False) -> dict:
+    lines = []
+    for doc_id, partial in updates.items():
+        lines.append(json.dumps({"update": {"_index": index, "_id": doc_id}}))
+        lines.append(json.dumps({"doc": partial, "doc_as_upsert": True} if upsert else {"doc": partial}))
+    return _send(lines)
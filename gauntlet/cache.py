@@ -0,0 +1,141 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from gauntlet.encoding import call_key
+from gauntlet.metrics import metrics
+
+_MISSING = object()
+PURGE_EVERY = 256
+
+
+def _encode(value):
+    # Results are stored as JSON, never pickled, so reading a row from a
+    # shared directory can't run code. Values JSON would change (tuples,
+    # non-string keys, objects) stay in the in-memory tier only.
+    try:
+        text = json.dumps(value, allow_nan=False)
+    except (TypeError, ValueError):
+        return None
+    return text if json.loads(text) == value else None
+
+
+def _disk_error(action: str, e: sqlite3.Error):
+    # The cache is an optimisation: a locked or broken results.db must never
+    # fail the tool call itself.
+    metrics.incr("cache.disk_errors")
+    print(f"  [gauntlet] Result cache {action} failed, skipping the disk tier: {e}")
+
+
+class DiskTier:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "results.db")
+        self._local = threading.local()
+        self._puts = 0
+        # Usually runs at decoration time in the parent process, so the setup
+        # connection is closed rather than left for forked workers to inherit.
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS results ("
+                        "key TEXT PRIMARY KEY, tool_name TEXT, value BLOB, expires REAL)"
+                    )
+                    conn.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            _disk_error("setup", e)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and process; WAL journaling lets worker
+        # processes read while another one writes. A connection inherited
+        # across fork is never reused.
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    def get(self, key: str):
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires FROM results WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            _disk_error("read", e)
+            return _MISSING
+        if row is None or row[1] < time.time():
+            return _MISSING
+        try:
+            return json.loads(row[0])
+        except ValueError:  # rows written by older, pickling versions
+            return _MISSING
+
+    def put(self, key: str, tool_name: str, value, expires: float):
+        text = _encode(value)
+        if text is None:
+            return
+        self._puts += 1
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                             (key, tool_name, text, expires))
+                if self._puts % PURGE_EVERY == 0:
+                    purged = conn.execute("DELETE FROM results WHERE expires < ?", (time.time(),)).rowcount
+                    metrics.incr("cache.disk_purged", purged)
+        except sqlite3.Error as e:
+            _disk_error("write", e)
+
+
+class ResultCache:
+    def __init__(self, tool_name: str, ttl: float, maxsize: int = 128, disk: DiskTier = None):
+        self.tool_name = tool_name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.disk = disk
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_call(self, fn, args, kwargs):
+        key = call_key(self.tool_name, fn, args, kwargs)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= now:
+                self._entries.move_to_end(key)
+                metrics.incr("cache.hit")
+                return entry[0]
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not _MISSING:
+                metrics.incr("cache.disk_hit")
+                self._store(key, value, now + self.ttl)
+                return value
+
+        metrics.incr("cache.miss")
+        value = fn(*args, **kwargs)
+        self._store(key, value, now + self.ttl)
+        if self.disk is not None:
+            self.disk.put(key, self.tool_name, value, now + self.ttl)
+        return value
+
+    def _store(self, key: str, value, expires: float):
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,32 @@
+import re
+import secrets
+
+CANARY_PREFIX = "GNTLT"
+
+# Every canary shares the prefix, so a single linear regex pass finds all
+# candidates regardless of how many tokens have been planted.
+_CANARY_RE = re.compile(rf"{CANARY_PREFIX}-[0-9a-f]{{12}}", re.IGNORECASE)
+
+
+def new_canary() -> str:
+    return f"{CANARY_PREFIX}-{secrets.token_hex(6)}"
+
+
+class CanaryRegistry:
+    def __init__(self):
+        self._planted = {}
+
+    def __len__(self):
+        return len(self._planted)
+
+    def plant(self, token: str, tool_name: str):
+        self._planted[token.lower()] = tool_name
+
+    def source(self, token: str) -> str:
+        return self._planted.get(token.lower(), "")
+
+    def scan(self, text: str) -> list:
+        if not self._planted or not text:
+            return []
+        found = dict.fromkeys(m.lower() for m in _CANARY_RE.findall(text))
+        return [t for t in found if t in self._planted]
@@ -38,10 +38,152 @@ class Config:
     def INFERENCE_ID(self):
         return _env("INFERENCE_ID", "my_inference_endpoint")
 
+    @property
+    def DECISION_INFERENCE_ID(self):
+        return _env("DECISION_INFERENCE_ID", "gauntlet_decision_endpoint")
+
+    @property
+    def DECISION_MODEL(self):
+        return _env("GAUNTLET_DECISION_MODEL", "gpt-4.1-nano")
+
+    @property
+    def DECISION_TIER(self):
+        return _env("GAUNTLET_DECISION_TIER", "inference").lower()
+
+    @property
+    def MOCK_AGENT_ID(self):
+        return _env("GAUNTLET_MOCK_AGENT_ID", "gauntlet-mock-agent")
+
+    @property
+    def MOCK_BACKEND(self):
+        return _env("GAUNTLET_MOCK_BACKEND", "kibana").lower()
+
+    @property
+    def MOCK_MODEL(self):
+        return _env("GAUNTLET_MOCK_MODEL", "gpt-4o")
+
+    @property
+    def OPENAI_BASE_URL(self):
+        return _env("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+    @property
+    def OPENAI_API_KEY(self):
+        return _env("OPENAI_API_KEY", "")
+
+    @property
+    def DECISION_COST_PER_1M(self):
+        return float(_env("GAUNTLET_DECISION_COST_PER_1M", "0.10"))
+
+    @property
+    def AGENT_COST_PER_1M(self):
+        return float(_env("GAUNTLET_AGENT_COST_PER_1M", "2.50"))
+
+    @property
+    def TARGET_COST_PER_1M(self):
+        return float(_env("GAUNTLET_TARGET_COST_PER_1M", "2.50"))
+
+    @property
+    def RUN_BUDGET_USD(self):
+        value = _env("GAUNTLET_RUN_BUDGET_USD", "")
+        return float(value) if value else None
+
+    @property
+    def CAMPAIGN_BUDGET_USD(self):
+        value = _env("GAUNTLET_CAMPAIGN_BUDGET_USD", "")
+        return float(value) if value else None
+
     @property
     def EMBEDDING_INFERENCE_ID(self):
         return _env("EMBEDDING_INFERENCE_ID", "my_embedding_endpoint")
 
+    @property
+    def HTTP_TIMEOUT(self):
+        return float(_env("GAUNTLET_HTTP_TIMEOUT", "30"))
+
+    @property
+    def INTERCEPT_DEADLINE(self):
+        return float(_env("GAUNTLET_INTERCEPT_DEADLINE", "60"))
+
+    @property
+    def HEDGE_ENABLED(self):
+        return _env("GAUNTLET_HEDGE", "OFF").upper() == "ON"
+
+    @property
+    def HEDGE_MIN_SAMPLES(self):
+        return int(_env("GAUNTLET_HEDGE_MIN_SAMPLES", "20"))
+
+    @property
+    def RETRY_ATTEMPTS(self):
+        return int(_env("GAUNTLET_RETRY_ATTEMPTS", "4"))
+
+    @property
+    def CONVERSE_CONCURRENCY(self):
+        return int(_env("GAUNTLET_CONVERSE_CONCURRENCY", "4"))
+
+    @property
+    def CONVERSE_MAX_CONCURRENCY(self):
+        return int(_env("GAUNTLET_CONVERSE_MAX_CONCURRENCY", "64"))
+
+    @property
+    def LIMITER_DIR(self):
+        return _env("GAUNTLET_LIMITER_DIR", "") or None
+
+    @property
+    def WAL_DIR(self):
+        return _env("GAUNTLET_WAL_DIR", "") or None
+
+    @property
+    def WAL_MAX_BYTES(self):
+        return int(_env("GAUNTLET_WAL_MAX_BYTES", str(512 << 20)))
+
+    @property
+    def WAL_FSYNC(self):
+        return _env("GAUNTLET_WAL_FSYNC", "interval").lower()
+
+    @property
+    def CACHE_DIR(self):
+        return _env("GAUNTLET_CACHE_DIR", "") or None
+
+    @property
+    def COVERAGE_TARGETS(self):
+        return int(_env("GAUNTLET_COVERAGE_TARGETS", "6"))
+
+    @property
+    def TRACE_DIR(self):
+        return _env("GAUNTLET_TRACE_DIR", "") or None
+
+    @property
+    def STORAGE(self):
+        return _env("GAUNTLET_STORAGE", "elasticsearch").lower()
+
+    @property
+    def SQLITE_PATH(self):
+        return _env("GAUNTLET_SQLITE_PATH", "gauntlet.db")
+
+    @property
+    def EXPORT_LAG(self):
+        return float(_env("GAUNTLET_EXPORT_LAG", "600"))
+
+    @property
+    def MAX_ARG_CHARS(self):
+        return int(_env("GAUNTLET_MAX_ARG_CHARS", "2000"))
+
+    @property
+    def MAX_RESULT_CHARS(self):
+        return int(_env("GAUNTLET_MAX_RESULT_CHARS", "16000"))
+
+    @property
+    def TARGETING(self):
+        return _env("GAUNTLET_TARGETING", "ON").upper() == "ON"
+
+    @property
+    def MUTATION_BUDGET(self):
+        return int(_env("GAUNTLET_MUTATION_BUDGET", "5"))
+
+    @property
+    def SAMPLE_RATE(self):
+        return float(_env("GAUNTLET_SAMPLE_RATE", "0.2"))
+
     @property
     def KIBANA_HEADERS(self):
         h = _headers(self.API_KEY)
@@ -60,3 +202,10 @@ INDEX_STM = "gauntlet-stm"
 INDEX_LTM_BUGS = "gauntlet-ltm-bugs"
 INDEX_LTM_FUNC = "gauntlet-ltm-func"
 INDEX_LTM_QUERIES = "gauntlet-ltm-queries"
+INDEX_OUTPUTS = "gauntlet-outputs"
+INDEX_RUNS = "gauntlet-runs"
+INDEX_METRICS = "gauntlet-metrics"
+INDEX_COVERAGE = "gauntlet-coverage"
+INDEX_ROLLUP_PATTERN_DAILY = "gauntlet-rollup-pattern-daily"
+INDEX_ROLLUP_PATTERN_TOOL = "gauntlet-rollup-pattern-tool"
+INDEX_ROLLUP_SEVERITY_RUN = "gauntlet-rollup-severity-run"
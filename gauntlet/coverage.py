@@ -0,0 +1,93 @@
+import random
+import threading
+from collections import Counter
+
+from gauntlet.encoding import content_hash
+from gauntlet.prompts import MUTATION_KINDS
+from gauntlet.storage import Storage, get_storage
+
+NOT_MUTATED = "none"
+LONG_TEXT_CHARS = 200
+
+# Checked in order, for replies that leave out "kind" or name one we don't know.
+_KIND_WORDS = (
+    ("prompt-injection", ("inject", "instruction", "ignore previous", "prompt")),
+    ("error-result", ("error", "fail", "timeout", "unavailable")),
+    ("removed-items", ("remov", "omit", "drop", "delet")),
+    ("added-items", ("added", "adding", "extra", "insert", "append")),
+    ("wrong-value", ("wrong", "incorrect", "off by", "swap")),
+)
+
+
+def mutation_kind(kind, description: str) -> str:
+    if kind in MUTATION_KINDS:
+        return kind
+    text = (description or "").lower()
+    return next((name for name, words in _KIND_WORDS if any(word in text for word in words)), "altered-field")
+
+
+def _value_class(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "zero" if value == 0 else "negative" if value < 0 else "number"
+    if isinstance(value, (str, bytes)):
+        return "empty" if not value.strip() else "long-text" if len(value) > LONG_TEXT_CHARS else "text"
+    if isinstance(value, (list, tuple, set)):
+        return "list" if value else "empty-list"
+    if isinstance(value, dict):
+        return "object" if value else "empty-object"
+    return type(value).__name__
+
+
+def arg_shape(arguments: dict) -> str:
+    # Arguments by class of value rather than value, e.g. "folder=text,limit=zero".
+    return ",".join(f"{name}={_value_class(value)}" for name, value in sorted(arguments.items())) or "no-args"
+
+
+class CoverageMap:
+    # (tool, argument shape, mutation kind) cells exercised by one run, built
+    # up call by call and written to gauntlet-coverage when the session ends.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells = Counter()
+
+    def observe(self, tool_name: str, shape: str, kind: str = None):
+        with self._lock:
+            self._cells[(tool_name, shape, kind or NOT_MUTATED)] += 1
+
+    def docs(self, run_id: str, timestamp: str) -> dict:
+        with self._lock:
+            cells = dict(self._cells)
+        return {
+            f"{run_id}:{content_hash(f'{tool_name}|{shape}|{kind}')[:16]}": {
+                "timestamp": timestamp,
+                "run_id": run_id,
+                "tool_name": tool_name,
+                "arg_shape": shape,
+                "mutation_kind": kind,
+                "calls": calls,
+            } for (tool_name, shape, kind), calls in cells.items()
+        }
+
+
+def uncovered(storage: Storage = None, tools: list = None) -> list:
+    # (tool, mutation kind) cells no run has mutated yet. Tools default to
+    # everything in gauntlet-ltm-func.
+    storage = storage or get_storage()
+    if not tools:
+        tools = sorted({row["tool_name"] for row in storage.tool_implementations() if row.get("tool_name")})
+    covered = {(row["tool_name"], row["mutation_kind"]) for row in storage.coverage()
+               if row["mutation_kind"] != NOT_MUTATED}
+    return [(tool, kind) for tool in tools for kind in MUTATION_KINDS if (tool, kind) not in covered]
+
+
+def pick_targets(cells: list, count: int, seed: str = None) -> list:
+    # Cells of the least-covered tools first; shuffled per run so concurrent
+    # runs don't all chase the same cell.
+    cells = list(cells)
+    random.Random(seed).shuffle(cells)
+    open_kinds = Counter(tool for tool, _ in cells)
+    return sorted(cells, key=lambda cell: -open_kinds[cell[0]])[:count]
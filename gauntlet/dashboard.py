@@ -3,27 +3,34 @@ import json
 
 import requests
 
-from gauntlet.config import config, INDEX_LTM_BUGS
+from gauntlet.bugs import SEVERITIES
+from gauntlet.config import (config, INDEX_LTM_BUGS, INDEX_METRICS, INDEX_ROLLUP_PATTERN_DAILY,
+                             INDEX_ROLLUP_PATTERN_TOOL, INDEX_ROLLUP_SEVERITY_RUN, INDEX_RUNS)
 
 DASHBOARD_ID = "gauntlet-dashboard"
 DATA_VIEW_ID = "gauntlet-ltm-bugs-dataview"
+RUNS_DATA_VIEW_ID = "gauntlet-runs-dataview"
+PATTERN_DAILY_DATA_VIEW_ID = "gauntlet-rollup-pattern-daily-dataview"
+PATTERN_TOOL_DATA_VIEW_ID = "gauntlet-rollup-pattern-tool-dataview"
+SEVERITY_RUN_DATA_VIEW_ID = "gauntlet-rollup-severity-run-dataview"
+METRICS_DATA_VIEW_ID = "gauntlet-metrics-dataview"
 
 # ── helpers ──────────────────────────────────────────────────────────────
 
-def _data_view():
+def _data_view(view_id=DATA_VIEW_ID, index=INDEX_LTM_BUGS, name="Gauntlet Bugs", time_field="timestamp"):
+    attributes = {"title": index, "name": name}
+    if time_field:
+        attributes["timeFieldName"] = time_field
     return {
         "type": "index-pattern",
-        "id": DATA_VIEW_ID,
-        "attributes": {
-            "title": INDEX_LTM_BUGS,
-            "timeFieldName": "timestamp",
-            "name": "Gauntlet Bugs",
-        },
+        "id": view_id,
+        "attributes": attributes,
         "references": [],
     }
 
 
-def _lens(obj_id, title, vis_type, layer_id, columns, column_order, vis_config, filters=None):
+def _lens(obj_id, title, vis_type, layer_id, columns, column_order, vis_config, filters=None,
+          data_view=DATA_VIEW_ID, kql=""):
     ref_name = f"indexpattern-datasource-layer-{layer_id}"
     state = {
         "datasourceStates": {
@@ -38,7 +45,7 @@ def _lens(obj_id, title, vis_type, layer_id, columns, column_order, vis_config,
         },
         "visualization": vis_config,
         "filters": filters or [],
-        "query": {"language": "kuery", "query": ""},
+        "query": {"language": "kuery", "query": kql},
     }
     return {
         "type": "lens",
@@ -50,7 +57,7 @@ def _lens(obj_id, title, vis_type, layer_id, columns, column_order, vis_config,
             "state": state,
         },
         "references": [
-            {"type": "index-pattern", "id": DATA_VIEW_ID, "name": ref_name},
+            {"type": "index-pattern", "id": data_view, "name": ref_name},
         ],
     }
 
@@ -65,6 +72,16 @@ def _count_col(label="Count"):
     }
 
 
+def _field_col(operation, field, label):
+    return {
+        "operationType": operation,
+        "sourceField": field,
+        "dataType": "number",
+        "isBucketed": False,
+        "label": label,
+    }
+
+
 def _terms_col(field, label=None, size=10, order_col="col-count"):
     return {
         "operationType": "terms",
@@ -82,15 +99,14 @@ def _terms_col(field, label=None, size=10, order_col="col-count"):
 
 # ── metric panels ───────────────────────────────────────────────────────
 
-def _metric_viz(obj_id, label, severity_filter=None):
+def _metric_viz(obj_id, label, column=None, kql="", data_view=DATA_VIEW_ID):
     layer_id = f"layer-{obj_id.split('-')[-1]}"
-    columns = {"col-count": _count_col(label)}
+    columns = {"col-count": column or _count_col(label)}
     vis_config = {
         "layerId": layer_id,
         "layerType": "data",
         "metricAccessor": "col-count",
     }
-    kql = f'severity: "{severity_filter}"' if severity_filter else ""
     ref_name = f"indexpattern-datasource-layer-{layer_id}"
     state = {
         "datasourceStates": {
@@ -117,7 +133,7 @@ def _metric_viz(obj_id, label, severity_filter=None):
             "state": state,
         },
         "references": [
-            {"type": "index-pattern", "id": DATA_VIEW_ID, "name": ref_name},
+            {"type": "index-pattern", "id": data_view, "name": ref_name},
         ],
     }
 
@@ -129,14 +145,14 @@ def _bugs_over_time():
     columns = {
         "col-x": {
             "operationType": "date_histogram",
-            "sourceField": "timestamp",
+            "sourceField": "day",
             "dataType": "date",
             "isBucketed": True,
-            "label": "Timestamp",
-            "params": {"interval": "auto"},
+            "label": "Day",
+            "params": {"interval": "1d"},
         },
-        "col-breakdown": _terms_col("severity", "Severity", size=5, order_col="col-count"),
-        "col-count": _count_col("Bugs"),
+        "col-breakdown": _terms_col("bug_pattern", "Bug Pattern", size=10, order_col="col-count"),
+        "col-count": _field_col("sum", "bugs", "Bugs"),
     }
     vis_config = {
         "preferredSeriesType": "bar_stacked",
@@ -161,6 +177,7 @@ def _bugs_over_time():
         columns,
         ["col-x", "col-breakdown", "col-count"],
         vis_config,
+        data_view=PATTERN_DAILY_DATA_VIEW_ID,
     )
 
 
@@ -168,7 +185,7 @@ def _bugs_by_pattern():
     layer_id = "layer-pattern"
     columns = {
         "col-slice": _terms_col("bug_pattern", "Bug Pattern", size=20, order_col="col-count"),
-        "col-count": _count_col("Count"),
+        "col-count": _field_col("sum", "bugs", "Bugs"),
     }
     vis_config = {
         "shape": "donut",
@@ -192,15 +209,14 @@ def _bugs_by_pattern():
         columns,
         ["col-slice", "col-count"],
         vis_config,
+        data_view=PATTERN_DAILY_DATA_VIEW_ID,
     )
 
 
 def _bugs_by_severity():
+    # One sum per severity column of the per-run rollup.
     layer_id = "layer-severity"
-    columns = {
-        "col-bucket": _terms_col("severity", "Severity", size=10, order_col="col-count"),
-        "col-count": _count_col("Bugs"),
-    }
+    columns = {f"col-{severity}": _field_col("sum", severity, severity.capitalize()) for severity in SEVERITIES}
     vis_config = {
         "preferredSeriesType": "bar_horizontal",
         "layers": [
@@ -208,11 +224,10 @@ def _bugs_by_severity():
                 "layerId": layer_id,
                 "layerType": "data",
                 "seriesType": "bar_horizontal",
-                "xAccessor": "col-bucket",
-                "accessors": ["col-count"],
+                "accessors": list(columns),
             }
         ],
-        "legend": {"isVisible": False},
+        "legend": {"isVisible": True, "position": "right"},
         "valueLabels": "show",
     }
     return _lens(
@@ -221,8 +236,9 @@ def _bugs_by_severity():
         "lnsXY",
         layer_id,
         columns,
-        ["col-bucket", "col-count"],
+        list(columns),
         vis_config,
+        data_view=SEVERITY_RUN_DATA_VIEW_ID,
     )
 
 
@@ -230,8 +246,8 @@ def _pattern_tools_heatmap():
     layer_id = "layer-heatmap"
     columns = {
         "col-y": _terms_col("bug_pattern", "Bug Pattern", size=20, order_col="col-value"),
-        "col-x": _terms_col("tools_involved", "Tool", size=20, order_col="col-value"),
-        "col-value": _count_col("Count"),
+        "col-x": _terms_col("tool", "Tool", size=20, order_col="col-value"),
+        "col-value": _field_col("sum", "bugs", "Bugs"),
     }
     vis_config = {
         "layerId": layer_id,
@@ -250,14 +266,58 @@ def _pattern_tools_heatmap():
         columns,
         ["col-y", "col-x", "col-value"],
         vis_config,
+        data_view=PATTERN_TOOL_DATA_VIEW_ID,
+    )
+
+
+def _runs_over_time():
+    layer_id = "layer-runs-time"
+    columns = {
+        "col-x": {
+            "operationType": "date_histogram",
+            "sourceField": "timestamp",
+            "dataType": "date",
+            "isBucketed": True,
+            "label": "Timestamp",
+            "params": {"interval": "auto"},
+        },
+        "col-breakdown": _terms_col("outcome", "Outcome", size=10, order_col="col-count"),
+        "col-count": _count_col("Runs"),
+    }
+    vis_config = {
+        "preferredSeriesType": "bar_stacked",
+        "layers": [
+            {
+                "layerId": layer_id,
+                "layerType": "data",
+                "seriesType": "bar_stacked",
+                "xAccessor": "col-x",
+                "accessors": ["col-count"],
+                "splitAccessor": "col-breakdown",
+            }
+        ],
+        "legend": {"isVisible": True, "position": "right"},
+        "valueLabels": "hide",
+    }
+    return _lens(
+        "gauntlet-viz-runs-over-time",
+        "Run Outcomes Over Time",
+        "lnsXY",
+        layer_id,
+        columns,
+        ["col-x", "col-breakdown", "col-count"],
+        vis_config,
+        data_view=RUNS_DATA_VIEW_ID,
     )
 
 
 def _bugs_by_run():
+    # Reads the per-run summaries, so runs are counted once however many
+    # documents they wrote.
     layer_id = "layer-run"
     columns = {
         "col-x": _terms_col("run_id", "Run", size=50, order_col="col-count"),
-        "col-count": _count_col("Bugs"),
+        "col-count": _field_col("sum", "bug_count", "Bugs"),
     }
     vis_config = {
         "preferredSeriesType": "bar",
@@ -281,50 +341,129 @@ def _bugs_by_run():
         columns,
         ["col-x", "col-count"],
         vis_config,
+        data_view=RUNS_DATA_VIEW_ID,
     )
 
 
 def _bug_detail_table():
-    layer_id = "layer-table"
-    columns = {
-        "col-ts": {
-            "operationType": "date_histogram",
-            "sourceField": "timestamp",
-            "dataType": "date",
-            "isBucketed": True,
-            "label": "Time",
-            "params": {"interval": "1h"},
+    # A saved ES|QL search lists raw bug documents page by page; nothing is
+    # aggregated, so it stays fast however many bugs there are.
+    query = (
+        f"FROM {INDEX_LTM_BUGS} "
+        "| SORT timestamp DESC "
+        "| KEEP timestamp, severity, bug_pattern, tools_involved, run_id, bug_id, bug_description"
+    )
+    return {
+        "type": "search",
+        "id": "gauntlet-search-bug-detail",
+        "attributes": {
+            "title": "Bug Detail Table",
+            "columns": ["timestamp", "severity", "bug_pattern", "tools_involved", "run_id", "bug_description"],
+            "sort": [["timestamp", "desc"]],
+            "isTextBasedQuery": True,
+            "kibanaSavedObjectMeta": {
+                "searchSourceJSON": json.dumps({"query": {"esql": query}, "filter": []}),
+            },
         },
-        "col-severity": _terms_col("severity", "Severity", size=100, order_col="col-count"),
-        "col-pattern": _terms_col("bug_pattern", "Pattern", size=100, order_col="col-count"),
-        "col-tools": _terms_col("tools_involved", "Tools", size=100, order_col="col-count"),
-        "col-desc": _terms_col("bug_description", "Description", size=100, order_col="col-count"),
-        "col-run": _terms_col("run_id", "Run ID", size=100, order_col="col-count"),
-        "col-count": _count_col("Count"),
+        "references": [],
     }
-    col_order = ["col-ts", "col-severity", "col-pattern", "col-tools", "col-desc", "col-run", "col-count"]
+
+
+# ── performance and cost panels (gauntlet-metrics) ─────────────────────
+
+def _date_col(label="Timestamp", interval="auto"):
+    return {
+        "operationType": "date_histogram",
+        "sourceField": "timestamp",
+        "dataType": "date",
+        "isBucketed": True,
+        "label": label,
+        "params": {"interval": interval},
+    }
+
+
+def _metrics_timeseries(obj_id, title, metric_columns, kql, interval="auto", series="line"):
+    layer_id = f"layer-{obj_id.split('-', 2)[-1]}"
+    columns = {"col-x": _date_col(interval=interval), **metric_columns}
     vis_config = {
-        "layerId": layer_id,
-        "layerType": "data",
-        "columns": [
-            {"columnId": "col-ts"},
-            {"columnId": "col-severity"},
-            {"columnId": "col-pattern"},
-            {"columnId": "col-tools"},
-            {"columnId": "col-desc"},
-            {"columnId": "col-run"},
-            {"columnId": "col-count", "hidden": True},
+        "preferredSeriesType": series,
+        "layers": [
+            {
+                "layerId": layer_id,
+                "layerType": "data",
+                "seriesType": series,
+                "xAccessor": "col-x",
+                "accessors": list(metric_columns),
+            }
         ],
-        "paging": {"size": 50, "enabled": True},
+        "legend": {"isVisible": len(metric_columns) > 1, "position": "right"},
+        "valueLabels": "hide",
+    }
+    return _lens(obj_id, title, "lnsXY", layer_id, columns, ["col-x", *metric_columns], vis_config,
+                 data_view=METRICS_DATA_VIEW_ID, kql=kql)
+
+
+def _intercept_latency():
+    return _metrics_timeseries("gauntlet-viz-intercept-latency", "Intercept Latency Percentiles (ms)", {
+        f"col-{pct}": _field_col("average", f"intercept_latency_{pct}_ms", pct) for pct in ("p50", "p95", "p99")
+    }, 'kind: "run"')
+
+
+def _runs_per_hour():
+    return _metrics_timeseries("gauntlet-viz-runs-per-hour", "Runs per Hour",
+                               {"col-count": _count_col("Runs")}, 'kind: "run"', interval="1h", series="bar")
+
+
+def _tokens_per_run():
+    return _metrics_timeseries("gauntlet-viz-tokens-per-run", "Tokens per Run",
+                               {"col-tokens": _field_col("average", "tokens", "Tokens")}, 'kind: "run"')
+
+
+def _slo_misses():
+    return _metrics_timeseries("gauntlet-viz-slo-misses", "SLO Misses and Fallbacks", {
+        "col-slo": _field_col("sum", "slo_misses", "SLO misses"),
+        "col-fallback": _field_col("sum", "fallbacks", "Fallbacks"),
+        "col-errors": _field_col("sum", "intercept_errors", "Errors"),
+    }, 'kind: "run"', series="bar_stacked")
+
+
+def _storage_write_latency():
+    return _metrics_timeseries("gauntlet-viz-storage-write-latency", "Storage Write Latency (ms)", {
+        "col-p50": _field_col("average", "storage_write_p50_ms", "p50"),
+        "col-p95": _field_col("average", "storage_write_p95_ms", "p95"),
+    }, 'kind: "run"')
+
+
+def _mutation_rate_by_tool():
+    layer_id = "layer-mutation-rate"
+    columns = {
+        "col-bucket": _terms_col("tool_name", "Tool", size=20, order_col="col-count"),
+        "col-count": _field_col("average", "mutation_rate", "Mutation rate"),
+    }
+    vis_config = {
+        "preferredSeriesType": "bar_horizontal",
+        "layers": [
+            {
+                "layerId": layer_id,
+                "layerType": "data",
+                "seriesType": "bar_horizontal",
+                "xAccessor": "col-bucket",
+                "accessors": ["col-count"],
+            }
+        ],
+        "legend": {"isVisible": False},
+        "valueLabels": "show",
     }
     return _lens(
-        "gauntlet-viz-bug-detail-table",
-        "Bug Detail Table",
-        "lnsDatatable",
+        "gauntlet-viz-mutation-rate-by-tool",
+        "Mutation Rate per Tool",
+        "lnsXY",
         layer_id,
         columns,
-        col_order,
+        ["col-bucket", "col-count"],
         vis_config,
+        data_view=METRICS_DATA_VIEW_ID,
+        kql='kind: "tool"',
     )
 
 
@@ -337,17 +476,32 @@ PANEL_LAYOUT = [
     {"id": "gauntlet-viz-metric-high",     "x": 20, "y": 0,  "w": 10, "h": 6},
     {"id": "gauntlet-viz-metric-medium",   "x": 30, "y": 0,  "w": 10, "h": 6},
     {"id": "gauntlet-viz-metric-low",      "x": 40, "y": 0,  "w": 8,  "h": 6},
-    # Row 1: time series (h=12)
-    {"id": "gauntlet-viz-bugs-over-time",  "x": 0,  "y": 6,  "w": 48, "h": 12},
-    # Row 2: donut + severity bar (h=14)
-    {"id": "gauntlet-viz-bugs-by-pattern",  "x": 0,  "y": 18, "w": 24, "h": 14},
-    {"id": "gauntlet-viz-bugs-by-severity", "x": 24, "y": 18, "w": 24, "h": 14},
-    # Row 3: heatmap (h=14)
-    {"id": "gauntlet-viz-pattern-tools-heatmap", "x": 0, "y": 32, "w": 48, "h": 14},
-    # Row 4: bugs by run (h=12)
-    {"id": "gauntlet-viz-bugs-by-run",     "x": 0,  "y": 46, "w": 48, "h": 12},
-    # Row 5: detail table (h=16)
-    {"id": "gauntlet-viz-bug-detail-table", "x": 0, "y": 58, "w": 48, "h": 16},
+    # Row 1: run metrics from gauntlet-runs (h=6)
+    {"id": "gauntlet-viz-metric-runs",              "x": 0,  "y": 6, "w": 10, "h": 6},
+    {"id": "gauntlet-viz-metric-runs-with-bugs",    "x": 10, "y": 6, "w": 10, "h": 6},
+    {"id": "gauntlet-viz-metric-bugs-per-run",      "x": 20, "y": 6, "w": 10, "h": 6},
+    {"id": "gauntlet-viz-metric-mutations-per-run", "x": 30, "y": 6, "w": 10, "h": 6},
+    {"id": "gauntlet-viz-metric-latency-p95",       "x": 40, "y": 6, "w": 8,  "h": 6},
+    # Row 2: time series (h=12)
+    {"id": "gauntlet-viz-bugs-over-time",  "x": 0,  "y": 12, "w": 24, "h": 12},
+    {"id": "gauntlet-viz-runs-over-time",  "x": 24, "y": 12, "w": 24, "h": 12},
+    # Row 3: donut + severity bar (h=14)
+    {"id": "gauntlet-viz-bugs-by-pattern",  "x": 0,  "y": 24, "w": 24, "h": 14},
+    {"id": "gauntlet-viz-bugs-by-severity", "x": 24, "y": 24, "w": 24, "h": 14},
+    # Row 4: heatmap (h=14)
+    {"id": "gauntlet-viz-pattern-tools-heatmap", "x": 0, "y": 38, "w": 48, "h": 14},
+    # Row 5: bugs by run (h=12)
+    {"id": "gauntlet-viz-bugs-by-run",     "x": 0,  "y": 52, "w": 48, "h": 12},
+    # Row 6: detail table (h=16)
+    {"id": "gauntlet-search-bug-detail", "type": "search", "x": 0, "y": 64, "w": 48, "h": 16},
+    # Row 7: performance and cost (h=12)
+    {"id": "gauntlet-viz-intercept-latency",     "x": 0,  "y": 80,  "w": 24, "h": 12},
+    {"id": "gauntlet-viz-runs-per-hour",         "x": 24, "y": 80,  "w": 24, "h": 12},
+    {"id": "gauntlet-viz-mutation-rate-by-tool", "x": 0,  "y": 92,  "w": 24, "h": 12},
+    {"id": "gauntlet-viz-tokens-per-run",        "x": 24, "y": 92,  "w": 16, "h": 12},
+    {"id": "gauntlet-viz-metric-cost-per-run",   "x": 40, "y": 92,  "w": 8,  "h": 12},
+    {"id": "gauntlet-viz-slo-misses",            "x": 0,  "y": 104, "w": 24, "h": 12},
+    {"id": "gauntlet-viz-storage-write-latency", "x": 24, "y": 104, "w": 24, "h": 12},
 ]
 
 
@@ -356,8 +510,9 @@ def _dashboard():
     references = []
     for idx, panel in enumerate(PANEL_LAYOUT):
         panel_idx = str(idx)
+        panel_type = panel.get("type", "lens")
         panels_json.append({
-            "type": "lens",
+            "type": panel_type,
             "gridData": {
                 "x": panel["x"],
                 "y": panel["y"],
@@ -371,7 +526,7 @@ def _dashboard():
         })
         references.append({
             "name": f"panel_{panel_idx}",
-            "type": "lens",
+            "type": panel_type,
             "id": panel["id"],
         })
 
@@ -399,17 +554,44 @@ def _dashboard():
 def create_dashboard():
     saved_objects = [
         _data_view(),
-        _metric_viz("gauntlet-viz-metric-total", "Total Bugs"),
-        _metric_viz("gauntlet-viz-metric-critical", "Critical Bugs", "critical"),
-        _metric_viz("gauntlet-viz-metric-high", "High Bugs", "high"),
-        _metric_viz("gauntlet-viz-metric-medium", "Medium Bugs", "medium"),
-        _metric_viz("gauntlet-viz-metric-low", "Low Bugs", "low"),
+        _data_view(RUNS_DATA_VIEW_ID, INDEX_RUNS, "Gauntlet Runs"),
+        _data_view(PATTERN_DAILY_DATA_VIEW_ID, INDEX_ROLLUP_PATTERN_DAILY, "Gauntlet Bugs per Pattern per Day", "day"),
+        _data_view(PATTERN_TOOL_DATA_VIEW_ID, INDEX_ROLLUP_PATTERN_TOOL, "Gauntlet Bugs per Pattern and Tool"),
+        _data_view(SEVERITY_RUN_DATA_VIEW_ID, INDEX_ROLLUP_SEVERITY_RUN, "Gauntlet Bugs per Run by Severity"),
+        _data_view(METRICS_DATA_VIEW_ID, INDEX_METRICS, "Gauntlet Metrics"),
+        _metric_viz("gauntlet-viz-metric-total", "Total Bugs",
+                    column=_field_col("sum", "bugs", "Total Bugs"), data_view=SEVERITY_RUN_DATA_VIEW_ID),
+        *[_metric_viz(f"gauntlet-viz-metric-{severity}", f"{severity.capitalize()} Bugs",
+                      column=_field_col("sum", severity, f"{severity.capitalize()} Bugs"),
+                      data_view=SEVERITY_RUN_DATA_VIEW_ID)
+          for severity in SEVERITIES],
+        _metric_viz("gauntlet-viz-metric-runs", "Runs", data_view=RUNS_DATA_VIEW_ID),
+        _metric_viz("gauntlet-viz-metric-runs-with-bugs", "Runs With Bugs",
+                    kql='outcome: ("bug" or "compromised")', data_view=RUNS_DATA_VIEW_ID),
+        _metric_viz("gauntlet-viz-metric-bugs-per-run", "Bugs per Run",
+                    column=_field_col("average", "bug_count", "Bugs per Run"), data_view=RUNS_DATA_VIEW_ID),
+        _metric_viz("gauntlet-viz-metric-mutations-per-run", "Mutations per Run",
+                    column=_field_col("average", "mutation_count", "Mutations per Run"),
+                    data_view=RUNS_DATA_VIEW_ID),
+        _metric_viz("gauntlet-viz-metric-latency-p95", "Intercept p95 (ms)",
+                    column=_field_col("average", "latency_p95_ms", "Intercept p95 (ms)"),
+                    data_view=RUNS_DATA_VIEW_ID),
         _bugs_over_time(),
+        _runs_over_time(),
         _bugs_by_pattern(),
         _bugs_by_severity(),
         _pattern_tools_heatmap(),
         _bugs_by_run(),
         _bug_detail_table(),
+        _intercept_latency(),
+        _runs_per_hour(),
+        _mutation_rate_by_tool(),
+        _tokens_per_run(),
+        _metric_viz("gauntlet-viz-metric-cost-per-run", "Cost per Run (USD)",
+                    column=_field_col("average", "cost_usd", "Cost per Run (USD)"),
+                    kql='kind: "run"', data_view=METRICS_DATA_VIEW_ID),
+        _slo_misses(),
+        _storage_write_latency(),
         _dashboard(),
     ]
 
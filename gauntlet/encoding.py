@@ -0,0 +1,110 @@
+import base64
+import dataclasses
+import datetime
+import decimal
+import enum
+import hashlib
+import inspect
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Default reprs embed memory addresses, which would make keys differ between
+# identical calls.
+_ADDRESS_RE = re.compile(r" at 0x[0-9a-fA-F]+")
+_INLINE_BYTES = 64
+MAX_DEPTH = 16
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def canonical(value, _depth: int = 0):
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return value if value == value and value not in (float("inf"), float("-inf")) else repr(value)
+    type_name = f"{type(value).__module__}.{type(value).__qualname__}"
+    if _depth >= MAX_DEPTH:
+        return {"__type__": type_name, "repr": _ADDRESS_RE.sub("", repr(value))[:200]}
+
+    depth = _depth + 1
+    if isinstance(value, dict):
+        return {str(k): canonical(v, depth) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v, depth) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(v, depth) for v in value), key=dumps)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        if len(data) <= _INLINE_BYTES:
+            return {"__bytes__": base64.b64encode(data).decode()}
+        return {"__bytes__": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return canonical(value.value, depth)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return canonical(dataclasses.asdict(value), depth)
+    if hasattr(value, "model_dump"):  # pydantic v2
+        return canonical(value.model_dump(), depth)
+    if hasattr(value, "__dict__") and not inspect.isroutine(value) and not isinstance(value, type):
+        return {"__type__": type_name, **canonical(vars(value), depth)}
+    return {"__type__": type_name, "repr": _ADDRESS_RE.sub("", repr(value))}
+
+
+def _dumps(value, default) -> str:
+    if orjson is not None:
+        return orjson.dumps(value, default=default, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(value, default=default, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False, allow_nan=False)
+
+
+def dumps(value) -> str:
+    # Plain JSON data goes straight to the serializer and only unknown objects
+    # hit canonical(); mixed-type keys or NaN need the full walk.
+    try:
+        return _dumps(value, canonical)
+    except (TypeError, ValueError):
+        return _dumps(canonical(value), None)
+
+
+def as_text(value) -> str:
+    return value if isinstance(value, str) else dumps(value)
+
+
+def truncate(text: str, limit: int) -> str:
+    if limit is None or len(text) <= limit:
+        return text
+    return f"{text[:limit]}…[truncated {len(text) - limit} of {len(text)} chars, sha256:{content_hash(text)}]"
+
+
+def bind_args(fn, args, kwargs) -> dict:
+    try:
+        bound = inspect.signature(fn).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return {"args": list(args), **kwargs}
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def encode_call(fn, args, kwargs, field_limit: int = None) -> dict:
+    call = canonical(bind_args(fn, args, kwargs))
+    if field_limit is None:
+        return call
+    encoded = {}
+    for name, value in call.items():
+        text = as_text(value)
+        encoded[name] = truncate(text, field_limit) if len(text) > field_limit else value
+    return encoded
+
+
+def call_key(tool_name: str, fn, args, kwargs) -> str:
+    return content_hash(dumps([tool_name, bind_args(fn, args, kwargs)]))
@@ -0,0 +1,15 @@
+import requests
+
+from gauntlet.config import config
+
+
+def esql(query: str, params: dict = None) -> list:
+    body = {"query": query}
+    if params:
+        body["params"] = [{name: value} for name, value in params.items()]
+    resp = requests.post(f"{config.ELASTICSEARCH_URL}/_query", json=body, headers=config.ES_HEADERS,
+                         timeout=config.HTTP_TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    names = [col["name"] for col in data.get("columns", [])]
+    return [dict(zip(names, row)) for row in data.get("values", [])]
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import requests
+
+from gauntlet.config import config, INDEX_LTM_BUGS, INDEX_LTM_QUERIES, INDEX_STM
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_INDICES = (INDEX_STM, INDEX_LTM_QUERIES, INDEX_LTM_BUGS)
+PAGE_SIZE = 1000
+KEEP_ALIVE = "2m"
+STATE_FILE = "_state.json"
+
+
+def _es(method: str, path: str, body: dict = None) -> dict:
+    resp = requests.request(method, f"{config.ELASTICSEARCH_URL}{path}", json=body,
+                            headers=config.ES_HEADERS, timeout=config.HTTP_TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def load_state(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, STATE_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(out_dir: str, state: dict):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def scan(index: str, since: str = None):
+    # A point in time keeps pages consistent while writers keep indexing.
+    pit = _es("POST", f"/{index}/_pit?keep_alive={KEEP_ALIVE}")["id"]
+    body = {
+        "size": PAGE_SIZE,
+        "pit": {"id": pit, "keep_alive": KEEP_ALIVE},
+        "sort": [{"timestamp": {"order": "asc", "format": "strict_date_optional_time"}},
+                 {"_shard_doc": "asc"}],
+        "query": {"range": {"timestamp": {"gte": since}}} if since else {"match_all": {}},
+    }
+    try:
+        while True:
+            page = _es("POST", "/_search", body)
+            hits = page["hits"]["hits"]
+            if not hits:
+                return
+            yield hits
+            body["pit"]["id"] = page.get("pit_id", body["pit"]["id"])
+            body["search_after"] = hits[-1]["sort"]
+    finally:
+        try:
+            _es("DELETE", "/_pit", {"id": body["pit"]["id"]})
+        except requests.RequestException:
+            pass
+
+
+def _write_partitions(out_dir: str, index: str, rows: list) -> int:
+    partitions = {}
+    for row in rows:
+        partitions.setdefault(row["timestamp"][:10], []).append(row)
+    for day, part in partitions.items():
+        directory = os.path.join(out_dir, index, f"date={day}")
+        os.makedirs(directory, exist_ok=True)
+        pq.write_table(pa.Table.from_pylist(part), os.path.join(directory, f"part-{uuid.uuid4().hex}.parquet"))
+    return len(partitions)
+
+
+def export_index(out_dir: str, index: str, state: dict, lag: float) -> int:
+    # Docs can land late (e.g. shipped from a WAL with their original
+    # timestamps), so each export re-reads a lag window before the watermark
+    # and skips the ids it already wrote.
+    entry = state.get(index, {})
+    watermark = entry.get("watermark")
+    since = (_parse_ts(watermark) - timedelta(seconds=lag)).isoformat() if watermark else None
+    recent = dict(entry.get("recent", {}))
+
+    exported, files = 0, 0
+    for hits in scan(index, since):
+        rows = []
+        for hit in hits:
+            # The sort value is the timestamp normalised by Elasticsearch,
+            # whatever format the document was written with.
+            ts = hit["sort"][0]
+            if hit["_id"] in recent or ts is None:
+                continue
+            rows.append({"doc_id": hit["_id"], **hit["_source"], "timestamp": ts})
+            recent[hit["_id"]] = ts
+            if watermark is None or _parse_ts(ts) > _parse_ts(watermark):
+                watermark = ts
+        if rows:
+            files += _write_partitions(out_dir, index, rows)
+            exported += len(rows)
+
+    if watermark:
+        cutoff = _parse_ts(watermark) - timedelta(seconds=lag)
+        state[index] = {"watermark": watermark,
+                        "recent": {doc_id: ts for doc_id, ts in recent.items() if _parse_ts(ts) >= cutoff}}
+    print(f"  [gauntlet] Exported {exported} docs from {index} into {files} files")
+    return exported
+
+
+def export(out_dir: str, indices=EXPORT_INDICES, lag: float = None) -> dict:
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow: pip install 'gauntlet[analytics]'")
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+    lag = config.EXPORT_LAG if lag is None else lag
+    counts = {}
+    for index in indices:
+        counts[index] = export_index(out_dir, index, state, lag)
+        _save_state(out_dir, state)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.export")
+    parser.add_argument("out_dir", help="Directory for the partitioned Parquet dataset")
+    parser.add_argument("--index", action="append", choices=EXPORT_INDICES,
+                        help="Index to export (repeatable, defaults to all)")
+    args = parser.parse_args()
+    print(json.dumps(export(args.out_dir, args.index or EXPORT_INDICES), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ INDEX_SCHEMAS = {
                 "original_result": {"type": "text"},
                 "mutated_result": {"type": "text"},
                 "mutation_description": {"type": "text"},
+                "mutation_kind": {"type": "keyword"},
                 "hypothesis_id": {"type": "keyword"},
             }
         }
@@ -21,6 +22,7 @@ INDEX_SCHEMAS = {
                     "type": "date",
                     "format": "strict_date_optional_time||epoch_millis||EEE MMM dd yyyy HH:mm:ss 'GMT'Z (zzzz)",
                 },
+                "ingested_at": {"type": "date"},
                 "run_id": {"type": "keyword"},
                 "hypothesis": {"type": "text"},
                 "bug_description": {"type": "text"},
@@ -58,6 +60,85 @@ INDEX_SCHEMAS = {
                 "result": {"type": "text"},
                 "was_mutated": {"type": "boolean"},
                 "mutation_applied": {"type": "text"},
+                "latency_ms": {"type": "float"},
+            }
+        }
+    },
+    "gauntlet-outputs": {
+        "mappings": {
+            "properties": {
+                "run_id": {"type": "keyword"},
+                "timestamp": {"type": "date"},
+                "hypothesis": {"type": "text"},
+                "final_output": {"type": "text"},
+                "mutation_count": {"type": "integer"},
+                "evaluated": {"type": "boolean"},
+            }
+        }
+    },
+    "gauntlet-runs": {
+        "mappings": {
+            "properties": {
+                "run_id": {"type": "keyword"},
+                "timestamp": {"type": "date"},
+                "started_at": {"type": "date"},
+                "hypothesis": {"type": "text"},
+                "task": {"type": "text"},
+                "duration_ms": {"type": "float"},
+                "tool_calls": {"type": "integer"},
+                "intercept_count": {"type": "integer"},
+                "mutation_count": {"type": "integer"},
+                "tokens": {"type": "long"},
+                "input_tokens": {"type": "long"},
+                "output_tokens": {"type": "long"},
+                "agent_tokens": {"type": "long"},
+                "cost_usd": {"type": "float"},
+                "llm_calls": {"type": "integer"},
+                "steps": {"type": "integer"},
+                "models": {"type": "keyword"},
+                "latency_p50_ms": {"type": "float"},
+                "latency_p95_ms": {"type": "float"},
+                "latency_p99_ms": {"type": "float"},
+                "outcome": {"type": "keyword"},
+                "bug_ids": {"type": "keyword"},
+                "bug_count": {"type": "integer"},
+            }
+        }
+    },
+    "gauntlet-metrics": {
+        "mappings": {
+            "properties": {
+                "timestamp": {"type": "date"},
+                "run_id": {"type": "keyword"},
+                "kind": {"type": "keyword"},
+                "tool_name": {"type": "keyword"},
+                "tool_calls": {"type": "integer"},
+                "intercepts": {"type": "integer"},
+                "mutations": {"type": "integer"},
+                "mutation_rate": {"type": "float"},
+                "tokens": {"type": "long"},
+                "cost_usd": {"type": "float"},
+                "intercept_latency_p50_ms": {"type": "float"},
+                "intercept_latency_p95_ms": {"type": "float"},
+                "intercept_latency_p99_ms": {"type": "float"},
+                "slo_misses": {"type": "integer"},
+                "fallbacks": {"type": "integer"},
+                "intercept_errors": {"type": "integer"},
+                "skipped": {"type": "integer"},
+                "storage_write_p50_ms": {"type": "float"},
+                "storage_write_p95_ms": {"type": "float"},
+            }
+        }
+    },
+    "gauntlet-coverage": {
+        "mappings": {
+            "properties": {
+                "timestamp": {"type": "date"},
+                "run_id": {"type": "keyword"},
+                "tool_name": {"type": "keyword"},
+                "arg_shape": {"type": "keyword"},
+                "mutation_kind": {"type": "keyword"},
+                "calls": {"type": "integer"},
             }
         }
     },
@@ -0,0 +1,189 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from gauntlet.config import config
+from gauntlet.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process slots are unavailable
+    fcntl = None
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DECREASE_COOLDOWN = 1.0
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+
+
+class AIMDLimiter:
+    def __init__(self, name: str, initial: int, maximum: int, minimum: int = 1,
+                 decrease: float = 0.5, slots_dir: str = None):
+        self.name = name
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self._inflight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._slots_dir = slots_dir
+        if slots_dir:
+            if fcntl is None:
+                raise RuntimeError("Cross-process limiting requires fcntl (POSIX only)")
+            os.makedirs(slots_dir, exist_ok=True)
+
+    def acquire(self, timeout: float = None):
+        # Raises TimeoutError when no slot frees up within timeout seconds.
+        started = time.monotonic()
+        until = None if timeout is None else started + timeout
+        with self._cond:
+            while self._inflight >= int(self.limit):
+                left = None if until is None else until - time.monotonic()
+                if left is not None and left <= 0:
+                    metrics.incr(f"{self.name}.queue_timeouts")
+                    raise TimeoutError(f"no {self.name} slot free within {timeout:.1f}s")
+                self._cond.wait(left)
+            self._inflight += 1
+            metrics.gauge(f"{self.name}.inflight", self._inflight)
+        try:
+            slot = self._acquire_slot(until) if self._slots_dir else None
+        except TimeoutError:
+            self.release(None, None)
+            metrics.incr(f"{self.name}.queue_timeouts")
+            raise
+        metrics.observe(f"{self.name}.queue_ms", (time.monotonic() - started) * 1000)
+        return slot
+
+    def _acquire_slot(self, until: float = None):
+        # Slot files are shared by every process pointing at the same directory,
+        # so the number of lockable slots bounds in-flight requests machine-wide.
+        while True:
+            for i in range(int(self.limit)):
+                handle = open(os.path.join(self._slots_dir, f"slot-{i}.lock"), "a")
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return handle
+                except OSError:
+                    handle.close()
+            if until is not None and time.monotonic() >= until:
+                raise TimeoutError(f"no {self.name} slot free across processes")
+            time.sleep(0.05)
+
+    def release(self, slot, throttled: bool):
+        # throttled is None when the request was never sent, which says
+        # nothing about the upstream and leaves the limit alone.
+        if slot is not None:
+            fcntl.flock(slot, fcntl.LOCK_UN)
+            slot.close()
+        with self._cond:
+            self._inflight -= 1
+            if throttled:
+                metrics.incr(f"{self.name}.throttled")
+                # Back off once per cooldown, not once per request that was
+                # already in flight when the upstream started throttling.
+                if time.monotonic() - self._last_decrease >= DECREASE_COOLDOWN:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+            elif throttled is not None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            metrics.gauge(f"{self.name}.limit", self.limit)
+            metrics.gauge(f"{self.name}.inflight", self._inflight)
+            self._cond.notify_all()
+
+
+def _retry_after(resp) -> float:
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, resp) -> float:
+    jitter = random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+    retry_after = _retry_after(resp)
+    return jitter if retry_after is None else min(MAX_DELAY, retry_after) + jitter / 4
+
+
+def request_with_retry(limiter: AIMDLimiter, method: str, url: str, retry_connect: bool = True,
+                       deadline: float = None, **kwargs) -> requests.Response:
+    # deadline is a time.monotonic() value: each attempt's timeout is capped at
+    # the time left, and nothing is retried past it.
+    attempts = config.RETRY_ATTEMPTS
+    timeout = kwargs.pop("timeout", None)
+    for attempt in range(1, attempts + 1):
+        resp, error = None, None
+        left = None if deadline is None else deadline - time.monotonic()
+        if left is not None and left <= 0:
+            raise requests.Timeout(f"deadline passed before {method} {url}")
+        try:
+            slot = limiter.acquire(left)
+        except TimeoutError:
+            raise requests.Timeout(f"deadline passed waiting for a {limiter.name} slot for {method} {url}")
+        # The wait for a slot counts against the deadline too.
+        if deadline is not None:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                limiter.release(slot, None)
+                raise requests.Timeout(f"deadline passed before {method} {url}")
+            kwargs["timeout"] = min(timeout, left) if timeout else left
+        elif timeout is not None:
+            kwargs["timeout"] = timeout
+        try:
+            resp = requests.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            error = e
+        finally:
+            throttled = resp is None or resp.status_code in RETRY_STATUSES
+            limiter.release(slot, throttled)
+
+        # Read timeouts are not retried: the intercept deadline already bounds them.
+        retryable = (resp is not None and resp.status_code in RETRY_STATUSES) or \
+            (retry_connect and isinstance(error, requests.ConnectionError))
+        if not retryable or attempt == attempts:
+            break
+        delay = _backoff(attempt, resp)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            break
+        metrics.incr(f"{limiter.name}.retries")
+        time.sleep(delay)
+
+    if error is not None:
+        raise error
+    return resp
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _limiter(name: str) -> AIMDLimiter:
+    with _limiters_lock:
+        if name not in _limiters:
+            slots_dir = config.LIMITER_DIR
+            _limiters[name] = AIMDLimiter(
+                name,
+                initial=config.CONVERSE_CONCURRENCY,
+                maximum=config.CONVERSE_MAX_CONCURRENCY,
+                slots_dir=slots_dir and os.path.join(slots_dir, name),
+            )
+        return _limiters[name]
+
+
+def converse_limiter() -> AIMDLimiter:
+    return _limiter("converse")
+
+
+def inference_limiter() -> AIMDLimiter:
+    return _limiter("inference")
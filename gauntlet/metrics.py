@@ -0,0 +1,69 @@
+import threading
+from collections import defaultdict, deque
+
+WINDOW = 1024
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = defaultdict(int)
+            self._gauges = {}
+            self._samples = defaultdict(lambda: deque(maxlen=WINDOW))
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            self._samples[name].append(value)
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, hits: str, misses: str) -> float:
+        with self._lock:
+            total = self._counters.get(hits, 0) + self._counters.get(misses, 0)
+            return self._counters.get(hits, 0) / total if total else 1.0
+
+    def percentile(self, name: str, pct: float):
+        with self._lock:
+            samples = list(self._samples.get(name, ()))
+        return _percentile(samples, pct) if samples else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = {name: list(values) for name, values in self._samples.items() if values}
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "distributions": {
+                name: {
+                    "count": len(values),
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "p99": _percentile(values, 99),
+                }
+                for name, values in samples.items()
+            },
+        }
+
+
+metrics = Metrics()
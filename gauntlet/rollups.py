@@ -0,0 +1,121 @@
+import requests
+
+from gauntlet.bugs import SEVERITIES
+from gauntlet.config import (config, INDEX_LTM_BUGS, INDEX_ROLLUP_PATTERN_DAILY, INDEX_ROLLUP_PATTERN_TOOL,
+                             INDEX_ROLLUP_SEVERITY_RUN)
+
+# Continuous transforms keep small rollup indices up to date, so dashboard
+# panels aggregate a few rows per day, run or pattern instead of every bug.
+# They sync on when a bug reached Elasticsearch, not when it was found: bugs
+# shipped late from the WAL or exported from SQLite keep their original
+# timestamp, which can be older than the transform checkpoint.
+INGEST_PIPELINE_ID = "gauntlet-ingested-at"
+INGEST_PIPELINE = {
+    "description": "Stamp each gauntlet bug with the time it was indexed",
+    "processors": [{"set": {"field": "ingested_at", "value": "{{{_ingest.timestamp}}}"}}],
+}
+SYNC = {"time": {"field": "ingested_at", "delay": "60s"}}
+FREQUENCY = "1m"
+
+# tools_involved is stored as one comma-joined keyword; the matrix needs a row
+# per tool.
+_TOOL_SCRIPT = (
+    "for (def value : doc['tools_involved']) {"
+    " for (def tool : value.splitOnToken(',')) {"
+    " String name = tool.trim(); if (!name.isEmpty()) { emit(name); } } }"
+)
+
+TRANSFORMS = {
+    "gauntlet-bugs-pattern-daily": {
+        "description": "Bugs per pattern per day",
+        "source": {"index": [INDEX_LTM_BUGS]},
+        "dest": {"index": INDEX_ROLLUP_PATTERN_DAILY},
+        "pivot": {
+            "group_by": {
+                "day": {"date_histogram": {"field": "timestamp", "calendar_interval": "1d"}},
+                "bug_pattern": {"terms": {"field": "bug_pattern"}},
+            },
+            "aggregations": {"bugs": {"value_count": {"field": "bug_id"}}},
+        },
+    },
+    "gauntlet-bugs-pattern-tool": {
+        "description": "Bugs per pattern and tool",
+        "source": {
+            "index": [INDEX_LTM_BUGS],
+            "runtime_mappings": {"tool": {"type": "keyword", "script": {"source": _TOOL_SCRIPT}}},
+        },
+        "dest": {"index": INDEX_ROLLUP_PATTERN_TOOL},
+        "pivot": {
+            "group_by": {
+                "bug_pattern": {"terms": {"field": "bug_pattern"}},
+                "tool": {"terms": {"field": "tool"}},
+            },
+            "aggregations": {
+                "bugs": {"value_count": {"field": "bug_id"}},
+                "timestamp": {"max": {"field": "timestamp"}},
+            },
+        },
+    },
+    "gauntlet-bugs-severity-run": {
+        "description": "Bug counts by severity per run",
+        "source": {"index": [INDEX_LTM_BUGS]},
+        "dest": {"index": INDEX_ROLLUP_SEVERITY_RUN},
+        "pivot": {
+            "group_by": {"run_id": {"terms": {"field": "run_id"}}},
+            "aggregations": {
+                "bugs": {"value_count": {"field": "bug_id"}},
+                "timestamp": {"max": {"field": "timestamp"}},
+                **{severity: {"filter": {"term": {"severity": severity}}} for severity in SEVERITIES},
+            },
+        },
+    },
+}
+
+
+def create_ingest_pipeline():
+    resp = requests.put(f"{config.ELASTICSEARCH_URL}/_ingest/pipeline/{INGEST_PIPELINE_ID}",
+                        json=INGEST_PIPELINE, headers=config.ES_HEADERS)
+    if resp.status_code != 200:
+        print(f"  Failed to create ingest pipeline {INGEST_PIPELINE_ID}: {resp.status_code} {resp.text}")
+        return
+    resp = requests.put(f"{config.ELASTICSEARCH_URL}/{INDEX_LTM_BUGS}/_settings",
+                        json={"index": {"default_pipeline": INGEST_PIPELINE_ID}}, headers=config.ES_HEADERS)
+    if resp.status_code != 200:
+        print(f"  Failed to set default pipeline on {INDEX_LTM_BUGS}: {resp.status_code} {resp.text}")
+        return
+    # Bugs indexed before the pipeline existed have no ingested_at, and the
+    # transforms would never see them.
+    resp = requests.post(
+        f"{config.ELASTICSEARCH_URL}/{INDEX_LTM_BUGS}/_update_by_query",
+        params={"pipeline": INGEST_PIPELINE_ID, "conflicts": "proceed", "refresh": "true"},
+        json={"query": {"bool": {"must_not": {"exists": {"field": "ingested_at"}}}}},
+        headers=config.ES_HEADERS,
+    )
+    if resp.status_code == 200:
+        print(f"  Created ingest pipeline: {INGEST_PIPELINE_ID} ({resp.json().get('updated', 0)} bugs backfilled)")
+    else:
+        print(f"  Failed to backfill ingested_at on {INDEX_LTM_BUGS}: {resp.status_code} {resp.text}")
+
+
+def create_transforms():
+    create_ingest_pipeline()
+    for transform_id, body in TRANSFORMS.items():
+        url = f"{config.ELASTICSEARCH_URL}/_transform/{transform_id}"
+        if requests.get(url, headers=config.ES_HEADERS).status_code == 200:
+            # Older setups synced on timestamp; move them onto ingested_at.
+            resp = requests.post(f"{url}/_update", json={"sync": SYNC, "frequency": FREQUENCY},
+                                 headers=config.ES_HEADERS)
+            if resp.status_code == 200:
+                print(f"  Transform already exists: {transform_id}")
+            else:
+                print(f"  Failed to update transform {transform_id}: {resp.status_code} {resp.text}")
+            continue
+        resp = requests.put(url, json={**body, "sync": SYNC, "frequency": FREQUENCY}, headers=config.ES_HEADERS)
+        if resp.status_code != 200:
+            print(f"  Failed to create transform {transform_id}: {resp.status_code} {resp.text}")
+            continue
+        resp = requests.post(f"{url}/_start", headers=config.ES_HEADERS)
+        if resp.status_code == 200:
+            print(f"  Created transform: {transform_id}")
+        else:
+            print(f"  Failed to start transform {transform_id}: {resp.status_code} {resp.text}")
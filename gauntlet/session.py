@@ -1,35 +1,137 @@
+import threading
+import time
 import uuid
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
-import requests
-
-from gauntlet.config import config, INDEX_STM
+from gauntlet.backends import MockAgentBackend, get_backend
+from gauntlet.bugs import bug_doc
+from gauntlet.canary import CanaryRegistry
+from gauntlet.config import (config, INDEX_COVERAGE, INDEX_LTM_BUGS, INDEX_LTM_QUERIES, INDEX_METRICS,
+                             INDEX_OUTPUTS, INDEX_RUNS, INDEX_STM)
+from gauntlet.coverage import CoverageMap
+from gauntlet.metrics import _percentile, metrics
+from gauntlet.storage import Storage, get_storage
+from gauntlet.taint import TaintTracker
+from gauntlet.usage import Ledger, usage_cost, usage_from_response
 
 
 class Session:
-    def __init__(self, agent_id: str = "gauntlet-mock-agent"):
+    def __init__(self, agent_id: str = None, backend: MockAgentBackend = None, storage: Storage = None,
+                 on_usage=None):
         self.run_id = str(uuid.uuid4())
-        self.agent_id = agent_id
+        self.started = time.monotonic()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.agent_id = agent_id or config.MOCK_AGENT_ID
+        self.backend = backend or get_backend()
+        self.storage = storage or get_storage()
         self.conversation_id = None
         self.hypothesis = None
         self.hypothesis_embedding = None
+        self.task = None
+        self.coverage = CoverageMap()
+        self.coverage_targets = []
+        self.canaries = CanaryRegistry()
+        self.taint = TaintTracker()
+        self.mutation_count = 0
+        self.calls = []
+        self.leaks = []
+        self.virtual_state = []
+        self.plan = None
+        self.verdict = None
+        self.compromised = None
+        self.outcome = None
+        self.pending_output = None
+        self.bug_ids = []
+        self.intercept_latencies = []
+        self.write_latencies = []
+        self.counters = Counter()
+        self._counters_lock = threading.Lock()
+        self.usage = Ledger(config.RUN_BUDGET_USD)
+        self.on_usage = on_usage
+        self.trace = None
+        if config.TRACE_DIR:
+            # Imported lazily so `python -m gauntlet.trace` doesn't import itself twice.
+            from gauntlet.trace import TraceWriter, trace_path
+            self.trace = TraceWriter(trace_path(self.run_id))
+            self.trace.write("run_start", {"run_id": self.run_id, "agent_id": self.agent_id})
 
-    def converse(self, message: str) -> dict:
-        url = f"{config.KIBANA_URL}/api/agent_builder/converse"
-        body = {
-            "input": message,
-            "agent_id": self.agent_id,
-        }
-        if self.conversation_id:
-            body["conversation_id"] = self.conversation_id
-        resp = requests.post(url, json=body, headers=config.KIBANA_HEADERS)
-        resp.raise_for_status()
-        data = resp.json()
-        self.conversation_id = data.get("conversation_id")
+    def converse(self, message: str, timeout: float = None, fresh: bool = False, deadline: float = None) -> dict:
+        # A fresh conversation (used for hedged requests) must not fork the session's thread.
+        started = time.monotonic()
+        with self.span("converse", fresh=fresh):
+            data = self.backend.converse(self.agent_id, message, None if fresh else self.conversation_id,
+                                         timeout or config.HTTP_TIMEOUT, deadline=deadline)
+        metrics.observe("converse.latency_ms", (time.monotonic() - started) * 1000)
+        self.record_usage(usage_from_response(data, message), "mock_agent")
+        if fresh:
+            self.backend.end_conversation(data.get("conversation_id"))
+        elif deadline is not None and time.monotonic() > deadline:
+            # The intercept gave up on this reply and later turns have already
+            # gone out on the current conversation; leave it in place.
+            metrics.incr("converse.late")
+        else:
+            self.conversation_id = data.get("conversation_id")
         return data
 
+    def record_usage(self, usage: dict, source: str):
+        cost = usage_cost(usage, config.AGENT_COST_PER_1M if source == "mock_agent" else config.TARGET_COST_PER_1M)
+        spent = self.usage.add(usage, cost, source)
+        for key in ("input_tokens", "output_tokens", "llm_calls", "steps"):
+            metrics.incr(f"usage.{source}.{key}", usage[key])
+        metrics.incr(f"usage.{source}.cost_usd", cost)
+        if usage["estimated"]:
+            metrics.incr(f"usage.{source}.estimated")
+        if self.on_usage:
+            self.on_usage(usage, cost, source, self.usage if spent else None)
+
+    def record(self, kind: str, payload: dict):
+        if self.trace is not None:
+            self.trace.write(kind, payload)
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        if self.trace is None:
+            yield
+            return
+        start_ns = time.time_ns()
+        try:
+            yield
+        finally:
+            self.record("span", {"name": name, "start_ns": start_ns,
+                                 "duration_ms": (time.time_ns() - start_ns) / 1e6,
+                                 "thread": threading.current_thread().name, **fields})
+
+    def incr(self, name: str, value: int = 1):
+        # Counted for this run as well as process-wide, so concurrent sessions
+        # don't report each other's misses and fallbacks.
+        metrics.incr(name, value)
+        with self._counters_lock:
+            self.counters[name] += value
+
+    def _write(self, index: str, doc: dict, doc_id: str = None):
+        started = time.monotonic()
+        with self.span("storage", index=index):
+            self.storage.write(index, doc, doc_id)
+        self.write_latencies.append((time.monotonic() - started) * 1000)
+
+    def close(self):
+        self.backend.end_conversation(self.conversation_id)
+        self.storage.flush()
+        if self.trace is not None:
+            self.trace.write("run_end", {
+                "hypothesis": self.hypothesis or "",
+                "mutation_count": self.mutation_count,
+                "verdict": self.verdict,
+                "compromised": bool(self.compromised),
+                "tokens": self.usage.tokens,
+                "cost_usd": self.usage.cost_usd,
+            })
+            self.trace.close()
+
     def store_mutation(self, tool_name: str, query: str, original_result: str,
-                       mutated_result: str, mutation_description: str):
+                       mutated_result: str, mutation_description: str, mutation_kind: str = ""):
         doc = {
             "run_id": self.run_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -38,15 +140,14 @@ class Session:
             "original_result": original_result,
             "mutated_result": mutated_result,
             "mutation_description": mutation_description,
+            "mutation_kind": mutation_kind,
             "hypothesis_id": self.hypothesis or "",
         }
-        url = f"{config.ELASTICSEARCH_URL}/{INDEX_STM}/_doc"
-        resp = requests.post(url, json=doc, headers=config.ES_HEADERS)
-        resp.raise_for_status()
+        self._write(INDEX_STM, doc)
 
     def store_query_result(self, tool_name: str, query_description: str,
                            query_params: str, result: str, was_mutated: bool,
-                           mutation_applied: str = ""):
+                           mutation_applied: str = "", latency_ms: float = None):
         doc = {
             "query_id": str(uuid.uuid4()),
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -57,7 +158,115 @@ class Session:
             "result": result,
             "was_mutated": was_mutated,
             "mutation_applied": mutation_applied,
+            "latency_ms": latency_ms,
         }
-        url = f"{config.ELASTICSEARCH_URL}/gauntlet-ltm-queries/_doc"
-        resp = requests.post(url, json=doc, headers=config.ES_HEADERS)
-        resp.raise_for_status()
+        self._write(INDEX_LTM_QUERIES, doc, doc["query_id"])
+
+    def store_bug(self, bug_id: str, bug_description: str, bug_pattern: str,
+                  assumption_violated: str, tools_involved: list, severity: str):
+        doc = bug_doc(bug_id, self.run_id, self.hypothesis, bug_description, bug_pattern,
+                      assumption_violated, tools_involved, severity)
+        self._write(INDEX_LTM_BUGS, doc, bug_id)
+        if bug_id not in self.bug_ids:
+            self.bug_ids.append(bug_id)
+
+    def store_output(self, final_output: str, evaluated: bool):
+        doc = {
+            "run_id": self.run_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "hypothesis": self.hypothesis or "",
+            "final_output": final_output,
+            "mutation_count": self.mutation_count,
+            "evaluated": evaluated,
+        }
+        if evaluated:
+            self._write(INDEX_OUTPUTS, doc, self.run_id)
+        else:
+            # Written after the run summary (store_run): once the evaluator can
+            # see the output, no later summary write can overwrite its outcome.
+            self.pending_output = doc
+
+    def store_run(self, outcome: str):
+        # One summary document per session, so run-level questions don't
+        # aggregate raw STM and query documents.
+        latencies = self.intercept_latencies
+        usage = self.usage.as_dict()
+        doc = {
+            "run_id": self.run_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "started_at": self.started_at,
+            "hypothesis": self.hypothesis or "",
+            "task": self.task or "",
+            "duration_ms": (time.monotonic() - self.started) * 1000,
+            "tool_calls": len(self.calls),
+            "intercept_count": len(latencies),
+            "mutation_count": self.mutation_count,
+            "tokens": usage["tokens"],
+            "input_tokens": usage["input_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "agent_tokens": self.usage.source_tokens("agent_under_test"),
+            "cost_usd": usage["cost_usd"],
+            "llm_calls": usage["llm_calls"],
+            "steps": usage["steps"],
+            "models": usage["models"],
+            "latency_p50_ms": _percentile(latencies, 50) if latencies else None,
+            "latency_p95_ms": _percentile(latencies, 95) if latencies else None,
+            "latency_p99_ms": _percentile(latencies, 99) if latencies else None,
+            "outcome": outcome,
+            "bug_ids": self.bug_ids,
+            "bug_count": len(self.bug_ids),
+        }
+        try:
+            self._write(INDEX_RUNS, doc, self.run_id)
+        finally:
+            if self.pending_output is not None:
+                self._write(INDEX_OUTPUTS, self.pending_output, self.run_id)
+                self.pending_output = None
+
+    def store_metrics(self):
+        # Performance and cost figures for the dashboard: one "run" document
+        # plus one "tool" document per tool called. Every field is this run's
+        # own; storage writes are what the run waited on (a WAL append when
+        # GAUNTLET_WAL_DIR is set).
+        timestamp = datetime.now(timezone.utc).isoformat()
+        latencies, writes = self.intercept_latencies, self.write_latencies
+        doc = {
+            "timestamp": timestamp,
+            "run_id": self.run_id,
+            "kind": "run",
+            "tool_calls": len(self.calls),
+            "intercepts": len(latencies),
+            "mutations": self.mutation_count,
+            "tokens": self.usage.tokens,
+            "cost_usd": self.usage.cost_usd,
+            "intercept_latency_p50_ms": _percentile(latencies, 50) if latencies else None,
+            "intercept_latency_p95_ms": _percentile(latencies, 95) if latencies else None,
+            "intercept_latency_p99_ms": _percentile(latencies, 99) if latencies else None,
+            "slo_misses": self.counters["intercept.slo_miss"],
+            "fallbacks": self.counters["intercept.fallback"],
+            "intercept_errors": self.counters["intercept.errors"],
+            "skipped": self.counters["intercept.skipped"],
+            "storage_write_p50_ms": _percentile(writes, 50) if writes else None,
+            "storage_write_p95_ms": _percentile(writes, 95) if writes else None,
+        }
+        self._write(INDEX_METRICS, doc, self.run_id)
+
+        tools = {}
+        for call in self.calls:
+            counts = tools.setdefault(call["tool_name"], {"tool_calls": 0, "intercepts": 0, "mutations": 0})
+            counts["tool_calls"] += 1
+            counts["intercepts"] += call.get("agent_ms") is not None
+            counts["mutations"] += bool(call["mutated"])
+        for tool_name, counts in tools.items():
+            self._write(INDEX_METRICS, {
+                "timestamp": timestamp,
+                "run_id": self.run_id,
+                "kind": "tool",
+                "tool_name": tool_name,
+                **counts,
+                "mutation_rate": counts["mutations"] / counts["tool_calls"],
+            }, f"{self.run_id}:{tool_name}")
+
+    def store_coverage(self):
+        for doc_id, doc in self.coverage.docs(self.run_id, datetime.now(timezone.utc).isoformat()).items():
+            self._write(INDEX_COVERAGE, doc, doc_id)
@@ -5,6 +5,8 @@ import requests
 from gauntlet.config import config
 from gauntlet.dashboard import create_dashboard
 from gauntlet.indices import INDEX_SCHEMAS
+from gauntlet.prompts import AGENT_INSTRUCTIONS
+from gauntlet.rollups import create_transforms
 from gauntlet.tools import get_tools
 
 
@@ -21,21 +23,7 @@ AGENT_DEF = {
     ),
     "labels": ["gauntlet", "fuzz-testing"],
     "configuration": {
-        "instructions": (
-            "You are an adversarial mock agent in the Gauntlet fuzz-testing system. "
-            "When you receive a tool call and its real result, your job is to mutate the result "
-            "in a way that is internally consistent with all prior mutations in this run "
-            "(check find-relevant-mutations) and grounded in realistic tool behavior "
-            "(check find-relevant-queries). "
-            "Your mutations should be subtle — the goal is to expose bugs in the agent under test, "
-            "not to produce obviously broken responses. "
-            "When you detect that the agent under test has failed due to your mutations, "
-            "use store-bug to record the confirmed bug. "
-            "Before each test run, call get-tool-implementations to understand the tools the agent "
-            "under test uses, then call generate-hypothesis 3 times and pick the hypothesis "
-            "with the embedding furthest from known bugs as your fuzzing intent for the run. "
-            "If no bugs exist yet, use the tool implementations to reason about likely failure modes."
-        ),
+        "instructions": AGENT_INSTRUCTIONS,
         "tools": [
             {
                 "tool_ids": [
@@ -43,6 +31,7 @@ AGENT_DEF = {
                     "find-relevant-queries",
                     "get-tool-implementations",
                     "generate-hypothesis",
+                    "generate-hypotheses",
                     "store-bug",
                 ]
             }
@@ -69,6 +58,17 @@ def create_inference_endpoints():
                 },
             },
         },
+        {
+            "task_type": "completion",
+            "id": config.DECISION_INFERENCE_ID,
+            "body": {
+                "service": "openai",
+                "service_settings": {
+                    "api_key": openai_key,
+                    "model_id": config.DECISION_MODEL,
+                },
+            },
+        },
         {
             "task_type": "text_embedding",
             "id": config.EMBEDDING_INFERENCE_ID,
@@ -182,16 +182,17 @@ def create_store_bug_tool(workflow_id: str):
 
 
 def create_agent():
-    url = f"{config.KIBANA_URL}/api/agent_builder/agents/{AGENT_DEF['id']}"
-    body = {k: v for k, v in AGENT_DEF.items() if k != "id"}
+    agent = {**AGENT_DEF, "id": config.MOCK_AGENT_ID}
+    url = f"{config.KIBANA_URL}/api/agent_builder/agents/{agent['id']}"
+    body = {k: v for k, v in agent.items() if k != "id"}
     if _exists(url, config.KIBANA_HEADERS):
         resp = requests.put(url, json=body, headers=config.KIBANA_HEADERS)
         verb = "Updated"
     else:
-        resp = requests.post(f"{config.KIBANA_URL}/api/agent_builder/agents", json=AGENT_DEF, headers=config.KIBANA_HEADERS)
+        resp = requests.post(f"{config.KIBANA_URL}/api/agent_builder/agents", json=agent, headers=config.KIBANA_HEADERS)
         verb = "Created"
     if resp.status_code in (200, 201):
-        print(f"  {verb} agent: {AGENT_DEF['id']}")
+        print(f"  {verb} agent: {agent['id']}")
     else:
         print(f"  Failed to upsert agent: {resp.status_code} {resp.text}")
 
@@ -201,6 +202,8 @@ def setup():
     create_inference_endpoints()
     print("Creating indices...")
     create_indices()
+    print("Creating rollup transforms...")
+    create_transforms()
     print("Creating ES|QL tools...")
     create_tools()
     print("Creating store-bug workflow...")
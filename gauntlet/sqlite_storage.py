@@ -0,0 +1,183 @@
+import argparse
+import atexit
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from gauntlet.bulk import bulk_write
+from gauntlet.config import config, INDEX_COVERAGE, INDEX_LTM_BUGS, INDEX_LTM_FUNC, INDEX_LTM_QUERIES, INDEX_STM
+from gauntlet.metrics import metrics
+from gauntlet.storage import Storage
+from gauntlet.tools import BUGS_PER_STRATUM, HYPOTHESIS_CANDIDATES
+from gauntlet.virtual import SIMULATED_MARKER
+
+MUTATION_FIELDS = ("timestamp", "tool_name", "query", "original_result", "mutated_result",
+                   "mutation_description", "hypothesis_id")
+QUERY_FIELDS = ("timestamp", "run_id", "tool_name", "query_description", "query_params", "result",
+                "was_mutated", "mutation_applied")
+FUNC_FIELDS = ("tool_name", "tool_type", "docstring", "source_code")
+
+
+class SQLiteStorage(Storage):
+    def __init__(self, path: str, batch_size: int = 200, max_delay: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.setup()
+        atexit.register(self.flush)
+
+    def setup(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "idx TEXT NOT NULL, id TEXT NOT NULL, run_id TEXT, tool_name TEXT, timestamp TEXT, "
+                "body TEXT NOT NULL, exported INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (idx, id))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS docs_run ON docs (idx, run_id, timestamp)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS docs_tool ON docs (idx, tool_name, timestamp)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS docs_unexported ON docs (idx) WHERE exported = 0")
+
+    # ── writing ──────────────────────────────────────────────────────────
+
+    def write(self, index: str, doc: dict, doc_id: str = None):
+        row = (index, doc_id or str(uuid.uuid4()), doc.get("run_id"), doc.get("tool_name"),
+               doc.get("timestamp"), json.dumps(doc))
+        with self._lock:
+            self._pending.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = len(self._pending) >= self.batch_size or time.monotonic() - self._oldest >= self.max_delay
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending, self._oldest = self._pending, [], None
+            if not rows:
+                return
+            started = time.monotonic()
+            # One transaction per batch; a rewritten id resets its export flag.
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO docs (idx, id, run_id, tool_name, timestamp, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        metrics.observe("storage.flush_ms", (time.monotonic() - started) * 1000)
+        metrics.incr("storage.written", len(rows))
+
+    # ── lookups ──────────────────────────────────────────────────────────
+
+    def _select(self, sql: str, params: tuple, fields) -> list:
+        # Reads flush first so the mocking agent always sees this run's own writes.
+        self.flush()
+        with self._lock:
+            bodies = [json.loads(body) for (body,) in self._conn.execute(sql, params)]
+        return [{field: body.get(field) for field in fields} for body in bodies] if fields else bodies
+
+    def find_mutations(self, run_id: str) -> list:
+        return self._select(
+            "SELECT body FROM docs WHERE idx = ? AND run_id = ? ORDER BY timestamp ASC LIMIT 100",
+            (INDEX_STM, run_id), MUTATION_FIELDS)
+
+    def find_queries(self, tool_name: str) -> list:
+        return self._select(
+            "SELECT body FROM docs WHERE idx = ? AND tool_name = ? ORDER BY timestamp DESC LIMIT 20",
+            (INDEX_LTM_QUERIES, tool_name), QUERY_FIELDS)
+
+    def tool_implementations(self) -> list:
+        return self._select("SELECT body FROM docs WHERE idx = ? LIMIT 50", (INDEX_LTM_FUNC,), FUNC_FIELDS)
+
+    def recent_results(self, tool_name: str) -> list:
+        rows = self._select(
+            "SELECT body FROM docs WHERE idx = ? AND tool_name = ? "
+            "AND json_extract(body, '$.was_mutated') = 0 "
+            "AND coalesce(json_extract(body, '$.mutation_applied'), '') NOT LIKE ? "
+            "ORDER BY timestamp DESC LIMIT 5",
+            (INDEX_LTM_QUERIES, tool_name, f"{SIMULATED_MARKER}%"), ("result",))
+        return [row["result"] for row in rows if row["result"]]
+
+    def generate_hypotheses(self) -> list:
+        # No COMPLETION here: return the stratified bug sample and let the
+        # mocking agent write the hypotheses itself.
+        # Like the ES|QL tool: a bounded random sample per stratum, and strata
+        # repeat with the next slice of their sample when there are fewer
+        # patterns than candidates.
+        cap = HYPOTHESIS_CANDIDATES * BUGS_PER_STRATUM
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT json_extract(body, '$.bug_pattern'), COUNT(*) FROM docs WHERE idx = ? GROUP BY 1",
+                (INDEX_LTM_BUGS,)).fetchall()
+            strata = {}
+            for pattern, count in rows:
+                picks = self._conn.execute(
+                    "SELECT json_extract(body, '$.bug_description'), json_extract(body, '$.assumption_violated') "
+                    "FROM docs WHERE idx = ? AND json_extract(body, '$.bug_pattern') IS ? ORDER BY random() LIMIT ?",
+                    (INDEX_LTM_BUGS, pattern, cap)).fetchall()
+                strata[pattern] = (count, [f"- {description} [Assumption: {assumption}]"
+                                           for description, assumption in picks])
+        ordered = sorted(strata.items(), key=lambda item: item[1][0])
+        candidates = [(variant, pattern, count, summaries)
+                      for variant in range(HYPOTHESIS_CANDIDATES)
+                      for pattern, (count, summaries) in ordered][:HYPOTHESIS_CANDIDATES]
+        return [{"bug_pattern": pattern, "bug_count": count,
+                 "bugs": summaries[variant * BUGS_PER_STRATUM:(variant + 1) * BUGS_PER_STRATUM]
+                 or summaries[:BUGS_PER_STRATUM],
+                 "instruction": "Write one NEW hypothesis grounded in, but different from, these bugs."}
+                for variant, pattern, count, summaries in candidates]
+
+    def coverage(self) -> list:
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tool_name, json_extract(body, '$.arg_shape'), json_extract(body, '$.mutation_kind'), "
+                "SUM(json_extract(body, '$.calls')), COUNT(DISTINCT run_id) FROM docs WHERE idx = ? "
+                "GROUP BY 1, 2, 3", (INDEX_COVERAGE,)).fetchall()
+        return [{"tool_name": tool_name, "arg_shape": shape, "mutation_kind": kind, "calls": calls, "runs": runs}
+                for tool_name, shape, kind, calls, runs in rows]
+
+    # ── export ───────────────────────────────────────────────────────────
+
+    def export(self, batch: int = 500) -> int:
+        self.flush()
+        exported = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT idx, id, body FROM docs WHERE exported = 0 LIMIT ?", (batch,)).fetchall()
+            if not rows:
+                return exported
+            result = bulk_write([{"index": idx, "id": doc_id, "doc": json.loads(body)}
+                                 for idx, doc_id, body in rows])
+            if result["failed"] or result["retryable"]:
+                raise RuntimeError(f"Export stopped: {result['failed'] + result['retryable']} bulk item failures")
+            with self._lock, self._conn:
+                self._conn.executemany("UPDATE docs SET exported = 1 WHERE idx = ? AND id = ?",
+                                       [(idx, doc_id) for idx, doc_id, _ in rows])
+            exported += len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.sqlite_storage")
+    parser.add_argument("command", choices=["export", "stat"])
+    parser.add_argument("--path", default=None, help="SQLite file (defaults to GAUNTLET_SQLITE_PATH)")
+    args = parser.parse_args()
+
+    storage = SQLiteStorage(args.path or config.SQLITE_PATH)
+    if args.command == "export":
+        print(f"Exported {storage.export()} documents to {config.ELASTICSEARCH_URL}")
+    else:
+        rows = storage._conn.execute(
+            "SELECT idx, count(*), sum(exported = 0) FROM docs GROUP BY idx ORDER BY idx").fetchall()
+        print(json.dumps({idx: {"docs": total, "unexported": pending} for idx, total, pending in rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import requests
+
+from gauntlet.config import config, INDEX_COVERAGE, INDEX_LTM_QUERIES
+from gauntlet.esql import esql
+from gauntlet.metrics import metrics
+from gauntlet.tools import get_tools
+from gauntlet.virtual import SIMULATED_MARKER
+
+_TEMPLATE_QUERY = (
+    f"FROM {INDEX_LTM_QUERIES} "
+    "| WHERE tool_name == ?tool_name AND was_mutated == false "
+    f'  AND (mutation_applied IS NULL OR NOT mutation_applied LIKE "{SIMULATED_MARKER}*") '
+    "| SORT timestamp DESC "
+    "| KEEP result "
+    "| LIMIT 5"
+)
+
+_COVERAGE_QUERY = (
+    f"FROM {INDEX_COVERAGE} "
+    "| STATS calls = SUM(calls), runs = COUNT_DISTINCT(run_id) BY tool_name, arg_shape, mutation_kind "
+    "| LIMIT 10000"
+)
+
+
+class Storage:
+    # Backs the STM/LTM writes and the lookups behind the mocking agent's tools.
+    def setup(self):
+        raise NotImplementedError
+
+    def write(self, index: str, doc: dict, doc_id: str = None):
+        raise NotImplementedError
+
+    def find_mutations(self, run_id: str) -> list:
+        raise NotImplementedError
+
+    def find_queries(self, tool_name: str) -> list:
+        raise NotImplementedError
+
+    def tool_implementations(self) -> list:
+        raise NotImplementedError
+
+    def recent_results(self, tool_name: str) -> list:
+        raise NotImplementedError
+
+    def generate_hypotheses(self) -> list:
+        raise NotImplementedError
+
+    def coverage(self) -> list:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+
+class ElasticsearchStorage(Storage):
+    def setup(self):
+        # Imported lazily: setup pulls in the dashboard and tool definitions.
+        from gauntlet.setup import setup
+        setup()
+
+    def write(self, index: str, doc: dict, doc_id: str = None):
+        if config.WAL_DIR:
+            # Imported lazily so `python -m gauntlet.wal` doesn't import itself twice.
+            from gauntlet.wal import get_wal
+            get_wal().append(index, doc, doc_id)
+            return
+        started = time.monotonic()
+        if doc_id:
+            url = f"{config.ELASTICSEARCH_URL}/{index}/_doc/{doc_id}"
+            resp = requests.put(url, json=doc, headers=config.ES_HEADERS, timeout=config.HTTP_TIMEOUT)
+        else:
+            url = f"{config.ELASTICSEARCH_URL}/{index}/_doc"
+            resp = requests.post(url, json=doc, headers=config.ES_HEADERS, timeout=config.HTTP_TIMEOUT)
+        resp.raise_for_status()
+        metrics.observe("es.write_ms", (time.monotonic() - started) * 1000)
+
+    def _tool_query(self, tool_id: str, params: dict = None) -> list:
+        query = next(t["configuration"]["query"] for t in get_tools() if t["id"] == tool_id)
+        return esql(query, params)
+
+    def find_mutations(self, run_id: str) -> list:
+        return self._tool_query("find-relevant-mutations", {"run_id": run_id})
+
+    def find_queries(self, tool_name: str) -> list:
+        return self._tool_query("find-relevant-queries", {"tool_name": tool_name})
+
+    def tool_implementations(self) -> list:
+        return self._tool_query("get-tool-implementations")
+
+    def recent_results(self, tool_name: str) -> list:
+        return [row["result"] for row in esql(_TEMPLATE_QUERY, {"tool_name": tool_name}) if row.get("result")]
+
+    def generate_hypotheses(self) -> list:
+        return self._tool_query("generate-hypotheses")
+
+    def coverage(self) -> list:
+        return esql(_COVERAGE_QUERY)
+
+
+STORAGES = ("elasticsearch", "sqlite")
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            name = config.STORAGE
+            if name not in STORAGES:
+                raise RuntimeError(f"GAUNTLET_STORAGE must be one of {STORAGES}, got {name!r}")
+            if name == "sqlite":
+                # Imported lazily so `python -m gauntlet.sqlite_storage` doesn't import itself twice.
+                from gauntlet.sqlite_storage import SQLiteStorage
+                _storage = SQLiteStorage(config.SQLITE_PATH)
+            else:
+                _storage = ElasticsearchStorage()
+        return _storage
@@ -0,0 +1,44 @@
+import re
+
+# Identifier-like tokens (addresses, URLs, keys, ids) are specific enough that
+# seeing one in a mutation tool's arguments means it was copied from the
+# mutated result. Plain prose is matched with word shingles instead.
+_TOKEN_RE = re.compile(r"[\w.@+/:-]{6,}")
+_IDENT_RE = re.compile(r"[\d@./_:]")
+_WORD_RE = re.compile(r"\w+")
+SHINGLE_WORDS = 6
+
+
+class RunCompromised(Exception):
+    pass
+
+
+def _tokens(text: str) -> set:
+    return {t.strip(".:-/").lower() for t in _TOKEN_RE.findall(text) if _IDENT_RE.search(t)}
+
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+class TaintTracker:
+    def __init__(self):
+        self._sources = {}
+
+    def __len__(self):
+        return len(self._sources)
+
+    def taint(self, tool_name: str, original: str, mutated: str, trusted: str = ""):
+        # trusted is text the user supplied (the task, the hypothesis); its
+        # fragments are never taint, even when a mutation repeats them.
+        known = _tokens(original) | _shingles(original) | _tokens(trusted) | _shingles(trusted)
+        introduced = (_tokens(mutated) | _shingles(mutated)) - known
+        for fragment in introduced:
+            self._sources.setdefault(fragment, tool_name)
+
+    def scan(self, text: str) -> list:
+        if not self._sources or not text:
+            return []
+        found = (_tokens(text) | _shingles(text)) & self._sources.keys()
+        return [(fragment, self._sources[fragment]) for fragment in sorted(found)]
@@ -0,0 +1,111 @@
+import json
+import random
+import re
+
+POLICIES = ("intercept", "sample", "pass")
+
+PLAN_FORMAT = (
+    '{"budget": <max mutations this run>, "tools": {"<tool name>": '
+    '{"policy": "intercept, sample or pass", "rate": <0-1, only for sample>}}}'
+)
+
+_WORD_RE = re.compile(r"[a-z]{3,}")
+_STOPWORDS = {"the", "and", "for", "with", "from", "that", "this", "get", "given", "into", "tool"}
+
+
+class TargetPlan:
+    def __init__(self, policies: dict, budget: int, seed: str = None, default_rate: float = 0.0):
+        self.policies = policies
+        self.budget = budget
+        self.default_rate = default_rate
+        # Seeded by run id, so replaying a run samples the same calls.
+        self._rng = random.Random(seed)
+
+    def skip_reason(self, tool_name: str, mutation_count: int):
+        if mutation_count >= self.budget:
+            return "mutation budget spent"
+        policy, rate = self.policies.get(tool_name, ("sample", self.default_rate))
+        if policy == "intercept":
+            return None
+        if policy == "sample" and self._rng.random() < rate:
+            return None
+        return "not targeted"
+
+    def as_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "tools": {name: {"policy": policy, "rate": rate}
+                      for name, (policy, rate) in self.policies.items()},
+        }
+
+
+def plan_prompt(hypothesis: str, tools: dict, max_budget: int) -> str:
+    listing = "\n".join(
+        f"- {name} ({info['kind']}): {(info['docstring'].strip().splitlines() or [''])[0]}"
+        for name, info in tools.items()
+    )
+    return (
+        "Plan which tool results you need to see to test the hypothesis. Use \"intercept\" for "
+        "tools whose results you will mutate, \"sample\" with a rate for tools you may need "
+        "occasionally, and \"pass\" for tools irrelevant to the hypothesis. Set budget to the "
+        "fewest mutations that can trigger the bug.\n"
+        f"Return raw JSON with no markdown code fences: {PLAN_FORMAT}\n\n"
+        f"Maximum budget: {max_budget}\n"
+        f"Hypothesis: {hypothesis}\n"
+        f"Tools:\n{listing}"
+    )
+
+
+def parse_plan(message: str, tool_names, max_budget: int, seed: str = None, default_rate: float = 0.0):
+    text = message or ""
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        data = json.loads(text[start:end + 1]) if start != -1 else None
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("tools"), dict):
+        return None
+
+    policies = {}
+    for name, entry in data["tools"].items():
+        if name not in tool_names or not isinstance(entry, dict):
+            continue
+        policy = str(entry.get("policy", "")).lower()
+        if policy not in POLICIES:
+            continue
+        try:
+            rate = min(1.0, max(0.0, float(entry.get("rate", 1.0 if policy == "intercept" else 0.0))))
+        except (TypeError, ValueError):
+            rate = default_rate
+        policies[name] = (policy, rate)
+    if not any(policy != "pass" for policy, _ in policies.values()):
+        return None
+
+    try:
+        budget = max(1, min(max_budget, int(data.get("budget", max_budget))))
+    except (TypeError, ValueError):
+        budget = max_budget
+    return TargetPlan(policies, budget, seed, default_rate)
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower().replace("_", " "))) - _STOPWORDS
+
+
+def heuristic_plan(hypothesis: str, tools: dict, max_budget: int, seed: str = None,
+                   default_rate: float = 0.0) -> TargetPlan:
+    # Tools the hypothesis names (or whose description it overlaps) are
+    # intercepted; everything else is sampled at the default rate.
+    words = _words(hypothesis or "")
+    policies = {}
+    for name, info in tools.items():
+        name_words = _words(name)
+        if name.lower() in (hypothesis or "").lower() or (name_words and name_words <= words):
+            policies[name] = ("intercept", 1.0)
+        elif len(_words(info["docstring"]) & words) >= 2:
+            policies[name] = ("sample", 0.5)
+        else:
+            policies[name] = ("sample", default_rate)
+    if not any(policy == "intercept" for policy, _ in policies.values()):
+        policies = {name: ("intercept", 1.0) for name in tools}
+    return TargetPlan(policies, max_budget, seed, default_rate)
@@ -0,0 +1,264 @@
+import argparse
+import bisect
+import json
+import os
+from datetime import datetime
+
+from gauntlet.config import config
+from gauntlet.storage import get_storage
+from gauntlet.trace import TraceReader, decode, trace_path
+
+# Where intervals overlap, time goes to the innermost activity: the later
+# category in this tuple. Time inside the run that no interval covers belongs
+# to the agent under test (its own LLM calls and framework).
+CATEGORIES = ("agent", "gauntlet", "evaluation", "tool", "decision", "mock_agent", "storage")
+_PRIORITY = {name: i for i, name in enumerate(CATEGORIES)}
+LABELS = {
+    "agent": "agent under test",
+    "gauntlet": "gauntlet overhead",
+    "evaluation": "evaluation",
+    "tool": "real tools",
+    "decision": "decision tier",
+    "mock_agent": "mock agent converse",
+    "storage": "storage",
+}
+SPAN_CATEGORIES = {"converse": "mock_agent", "storage": "storage", "decision": "decision"}
+STEPS = ("hypothesize", "plan", "task", "intercept", "evaluate")
+_QUIET_EVENTS = ("tool_call_start", "tool_call_end", "evaluate_start", "evaluate_end")
+MIN_GAP_NS = 1_000_000
+
+
+def _interval(start: int, end: int, category: str, label: str, thread: str, step: bool, detail: dict = None):
+    return {"start": start, "end": max(start, end), "category": category, "label": label,
+            "thread": thread or "session", "step": step, "detail": detail or {}}
+
+
+def load_run(path: str) -> dict:
+    intervals, instants, calls = [], [], []
+    start = end = evaluate_start = None
+    last = 0
+    summary = {}
+    with TraceReader(path) as reader:
+        run_id = reader.run_id
+        for kind, ts, payload in reader:
+            record = decode(payload)
+            last = max(last, ts)
+            if kind == "run_start":
+                start = ts
+            elif kind == "run_end":
+                end, summary = ts, record
+            elif kind == "span":
+                name = record.pop("name")
+                span_start = record.pop("start_ns")
+                span_end = span_start + int(record.pop("duration_ms") * 1e6)
+                intervals.append(_interval(span_start, span_end, SPAN_CATEGORIES.get(name, "gauntlet"), name,
+                                           record.pop("thread", None), name in STEPS, record))
+            elif kind == "call":
+                call_start = record["start_ns"]
+                thread = record.get("thread")
+                intervals.append(_interval(
+                    call_start, call_start + int(record["total_ms"] * 1e6), "gauntlet",
+                    f"intercept {record['tool_name']}", thread, True,
+                    {"outcome": record.get("outcome", ""), "mutated": record.get("mutated", False)}))
+                intervals.append(_interval(call_start, call_start + int(record["tool_ms"] * 1e6), "tool",
+                                           record["tool_name"], thread, False))
+                calls.append(record)
+            elif record["type"] == "evaluate_start":
+                evaluate_start = ts
+            elif record["type"] == "evaluate_end" and evaluate_start is not None:
+                intervals.append(_interval(evaluate_start, ts, "evaluation", "evaluate", None, True))
+                evaluate_start = None
+            elif record["type"] not in _QUIET_EVENTS and not (
+                    record["type"] == "intercept" and not record["payload"].get("mutated")):
+                instants.append({"ts": ts, "name": record["type"], "args": record["payload"]})
+
+    if start is None:
+        start = min((iv["start"] for iv in intervals), default=last)
+    return {"run_id": run_id, "start": start, "end": end or last, "summary": summary,
+            "intervals": intervals, "instants": instants, "calls": calls, "mutations": []}
+
+
+def _ts_ns(value: str) -> int:
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1e9)
+
+
+def attach_mutations(run: dict, storage=None):
+    # Mutations committed to gauntlet-stm, pinned on the timeline.
+    for row in (storage or get_storage()).find_mutations(run["run_id"]):
+        ts = _ts_ns(row["timestamp"])
+        mutation = {"ts": ts, "tool_name": row.get("tool_name"),
+                    "description": row.get("mutation_description") or ""}
+        run["mutations"].append(mutation)
+        run["instants"].append({"ts": ts, "name": "mutation", "args": mutation})
+
+
+def _attribute(intervals: list, lo: int, hi: int) -> dict:
+    edges = []
+    for iv in intervals:
+        start, end = max(iv["start"], lo), min(iv["end"], hi)
+        if end > start:
+            priority = _PRIORITY[iv["category"]]
+            edges += [(start, 1, priority), (end, -1, priority)]
+    edges.sort()
+
+    active = [0] * len(CATEGORIES)
+    totals = dict.fromkeys(CATEGORIES, 0.0)
+    cursor = lo
+    for ts, delta, priority in edges:
+        if ts > cursor:
+            innermost = max((i for i, count in enumerate(active) if count), default=0)
+            totals[CATEGORIES[innermost]] += (ts - cursor) / 1e6
+            cursor = ts
+        active[priority] += delta
+    if hi > cursor:
+        totals["agent"] += (hi - cursor) / 1e6
+    return totals
+
+
+def critical_path(run: dict) -> list:
+    # Walk back from the end of the run, always taking the step that finished
+    # last before the cursor. Of steps that ran in parallel only the one that
+    # gated progress lands on the path; gaps between steps are the agent under
+    # test deciding what to do next.
+    steps = sorted((iv for iv in run["intervals"] if iv["step"]), key=lambda iv: iv["end"])
+    ends = [iv["end"] for iv in steps]
+    path, cursor, limit = [], run["end"], len(steps)
+    while True:
+        index = bisect.bisect_right(ends, cursor, 0, limit) - 1
+        if index < 0:
+            break
+        step, limit = steps[index], index
+        if cursor - step["end"] >= MIN_GAP_NS:
+            path.append(_interval(step["end"], cursor, "agent", LABELS["agent"], None, True))
+        path.append(step)
+        cursor = min(cursor, step["start"])
+    if cursor - run["start"] >= MIN_GAP_NS:
+        path.append(_interval(run["start"], cursor, "agent", LABELS["agent"], None, True))
+    path.reverse()
+    return path
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1e6, 3)
+
+
+def analyse(run: dict, top: int = 5) -> dict:
+    start, end = run["start"], run["end"]
+    breakdown = _attribute(run["intervals"], start, end)
+    path = []
+    for step in critical_path(run):
+        shares = _attribute(run["intervals"], step["start"], step["end"]) if step["category"] != "agent" else {}
+        path.append({
+            "label": step["label"],
+            "start_ms": _ms(step["start"] - start),
+            "duration_ms": _ms(step["end"] - step["start"]),
+            "breakdown_ms": {name: round(ms, 3) for name, ms in shares.items() if ms >= 0.001},
+            **step["detail"],
+        })
+    slowest = sorted(run["calls"], key=lambda call: call["total_ms"], reverse=True)[:top]
+    return {
+        "run_id": run["run_id"],
+        "duration_ms": _ms(end - start),
+        "breakdown_ms": {name: round(ms, 3) for name, ms in breakdown.items()},
+        "critical_path": path,
+        "slowest_intercepts": [{
+            "tool_name": call["tool_name"],
+            "outcome": call.get("outcome", ""),
+            "start_ms": _ms(call["start_ns"] - start),
+            "total_ms": round(call["total_ms"], 3),
+            "tool_ms": round(call["tool_ms"], 3),
+            "agent_ms": None if call.get("agent_ms") is None else round(call["agent_ms"], 3),
+        } for call in slowest],
+        "mutations": [{"start_ms": _ms(m["ts"] - start), "tool_name": m["tool_name"],
+                       "description": m["description"]} for m in run["mutations"]],
+        "summary": run["summary"],
+    }
+
+
+def _seconds(ms: float) -> str:
+    return f"{ms / 1000:8.2f}s"
+
+
+def format_text(report: dict) -> str:
+    total = report["duration_ms"] or 1.0
+    lines = [f"Run {report['run_id']}: {report['duration_ms'] / 1000:.2f}s", ""]
+    for name, ms in sorted(report["breakdown_ms"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {LABELS[name]:<22}{_seconds(ms)}  {100 * ms / total:5.1f}%")
+
+    lines += ["", "Critical path:"]
+    for step in report["critical_path"]:
+        shares = ", ".join(f"{LABELS[name]} {ms / 1000:.2f}s" for name, ms in
+                           sorted(step["breakdown_ms"].items(), key=lambda item: -item[1]))
+        outcome = f" [{step['outcome']}]" if step.get("outcome") else ""
+        lines.append(f"  +{step['start_ms'] / 1000:7.2f}s {_seconds(step['duration_ms'])}  "
+                     f"{step['label']}{outcome}" + (f"  ({shares})" if shares else ""))
+
+    lines += ["", "Slowest intercepts:"]
+    for call in report["slowest_intercepts"]:
+        agent = "-" if call["agent_ms"] is None else f"{call['agent_ms'] / 1000:.2f}s"
+        lines.append(f"  {_seconds(call['total_ms'])}  {call['tool_name']:<24} tool {call['tool_ms'] / 1000:.2f}s"
+                     f"  mock agent {agent}  {call['outcome']}")
+
+    if report["mutations"]:
+        lines += ["", "Mutations (gauntlet-stm):"]
+        for mutation in report["mutations"]:
+            lines.append(f"  +{mutation['start_ms'] / 1000:7.2f}s  {mutation['tool_name']}: {mutation['description']}")
+    return "\n".join(lines)
+
+
+def chrome_trace(run: dict) -> dict:
+    # Trace Event Format, for chrome://tracing or https://ui.perfetto.dev.
+    start = run["start"]
+    threads = {LABELS["agent"]: 0}
+    events = []
+
+    def lane(name: str) -> int:
+        return threads.setdefault(name, len(threads))
+
+    for step in critical_path(run):
+        if step["category"] == "agent":
+            events.append({"name": step["label"], "cat": "agent", "ph": "X", "pid": 1, "tid": 0,
+                           "ts": (step["start"] - start) / 1e3, "dur": (step["end"] - step["start"]) / 1e3})
+    for iv in sorted(run["intervals"], key=lambda iv: (iv["start"], -iv["end"])):
+        events.append({"name": iv["label"], "cat": iv["category"], "ph": "X", "pid": 1, "tid": lane(iv["thread"]),
+                       "ts": (iv["start"] - start) / 1e3, "dur": (iv["end"] - iv["start"]) / 1e3,
+                       "args": iv["detail"]})
+    for instant in run["instants"]:
+        events.append({"name": instant["name"], "ph": "i", "s": "p", "pid": 1, "tid": 0,
+                       "ts": (instant["ts"] - start) / 1e3, "args": instant["args"]})
+    events += [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+               for name, tid in threads.items()]
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run_id": run["run_id"]}}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.timeline")
+    parser.add_argument("run", help="Trace file, or a run id under GAUNTLET_TRACE_DIR")
+    parser.add_argument("--format", choices=["text", "json", "chrome"], default="text")
+    parser.add_argument("--top", type=int, default=5, help="Slowest intercepts to list")
+    parser.add_argument("--stm", action="store_true", help="Pin the run's gauntlet-stm mutations on the timeline")
+    parser.add_argument("-o", "--output", help="Write to a file instead of stdout")
+    args = parser.parse_args()
+
+    path = args.run if os.path.exists(args.run) or not config.TRACE_DIR else trace_path(args.run)
+    if not os.path.exists(path):
+        parser.error(f"no trace at {path}; pass a trace file or set GAUNTLET_TRACE_DIR")
+    run = load_run(path)
+    if args.stm:
+        attach_mutations(run)
+
+    if args.format == "chrome":
+        output = json.dumps(chrome_trace(run))
+    elif args.format == "json":
+        output = json.dumps(analyse(run, args.top), indent=2)
+    else:
+        output = format_text(analyse(run, args.top))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from gauntlet.config import config
 
+HYPOTHESIS_CANDIDATES = 3
+BUGS_PER_STRATUM = 4
+
 
 def get_tools():
     return [
@@ -102,4 +105,51 @@ def get_tools():
                 "params": {},
             },
         },
+        {
+            "id": "generate-hypotheses",
+            "type": "esql",
+            "description": (
+                f"Generates {HYPOTHESIS_CANDIDATES} diverse candidate bug hypotheses in a single call. "
+                "Known bugs are sampled and stratified by bug_pattern, each stratum seeds one candidate, "
+                "and every candidate is returned with its embedding. Pick the candidate with the highest "
+                "novelty instead of calling generate-hypothesis repeatedly. "
+                "This tool takes no parameters — inference endpoints are pre-configured."
+            ),
+            "configuration": {
+                "query": (
+                    # Each bug gets a per-query random prefix, so TOP keeps a bounded
+                    # random sample of every stratum. Strata are repeated (with the
+                    # next slice of their sample) when there are fewer patterns than
+                    # candidates.
+                    "FROM gauntlet-ltm-bugs "
+                    "| EVAL bug_summary = CONCAT("
+                    '    "- ", bug_description, '
+                    '    " [Assumption: ", assumption_violated, "]"'
+                    "  ), "
+                    '  sample_key = CONCAT(SUBSTRING(HASH("md5", CONCAT(bug_id, TO_STRING(NOW()))), 1, 8), " ", '
+                    "    bug_summary) "
+                    f'| STATS picks = TOP(sample_key, {HYPOTHESIS_CANDIDATES * BUGS_PER_STRATUM}, "asc"), '
+                    "    bug_count = COUNT(*) BY bug_pattern "
+                    f"| EVAL variant = [{', '.join(str(i) for i in range(HYPOTHESIS_CANDIDATES))}] "
+                    "| MV_EXPAND variant "
+                    "| SORT variant ASC, bug_count ASC "
+                    f"| LIMIT {HYPOTHESIS_CANDIDATES} "
+                    f"| EVAL bugs = COALESCE(MV_SLICE(picks, variant * {BUGS_PER_STRATUM}, "
+                    f"    variant * {BUGS_PER_STRATUM} + {BUGS_PER_STRATUM - 1}), "
+                    f"    MV_SLICE(picks, 0, {BUGS_PER_STRATUM - 1})) "
+                    "| EVAL prompt = CONCAT("
+                    '    "You are a hypothesis generator for an AI agent fuzz-testing system. ", '
+                    '    "Here are known bugs of the pattern \'", bug_pattern, "\' found during testing:\\n", '
+                    '    REPLACE(MV_CONCAT(bugs, "\\n"), "(^|\\n)[0-9a-f]{8} ", "$1"), '
+                    '    "\\n\\nGenerate a NEW hypothesis for a bug that is grounded in realistic tool behavior ", '
+                    '    "but DIFFERENT from all of the above. Describe a specific, testable scenario where an ", '
+                    '    "AI agent would fail when interacting with tools. Return only the hypothesis as a single paragraph."'
+                    "  ) "
+                    f'| COMPLETION hypothesis = prompt WITH {{ "inference_id": "{config.INFERENCE_ID}" }} '
+                    f'| EVAL embedding = TEXT_EMBEDDING(hypothesis, "{config.EMBEDDING_INFERENCE_ID}") '
+                    "| KEEP bug_pattern, bug_count, hypothesis, embedding"
+                ),
+                "params": {},
+            },
+        },
     ]
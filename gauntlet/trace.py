@@ -0,0 +1,182 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import Counter
+
+from gauntlet.config import config
+from gauntlet.encoding import dumps
+from gauntlet.metrics import metrics
+
+# File layout: MAGIC, then records of
+#   u32 payload length | u8 kind | i64 wall-clock ns | payload (compact JSON)
+# all little-endian. Records are only ever appended and each one is flushed
+# as it is written, so a crash leaves at most a torn last record, which
+# readers skip, and a live run's trace can be read while it grows.
+MAGIC = b"GTRACE\x00\x01"
+_HEADER = struct.Struct("<IBq")
+KINDS = {"run_start": 1, "event": 2, "call": 3, "run_end": 4, "span": 5}
+_NAMES = {code: name for name, code in KINDS.items()}
+SUFFIX = ".trace"
+
+
+def trace_path(run_id: str, directory: str = None) -> str:
+    return os.path.join(directory or config.TRACE_DIR, f"{run_id}{SUFFIX}")
+
+
+class TraceWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+
+    def write(self, kind: str, payload: dict):
+        data = dumps(payload).encode("utf-8", "surrogatepass")
+        record = _HEADER.pack(len(data), KINDS[kind], time.time_ns()) + data
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(record)
+            self._file.flush()
+        metrics.incr("trace.records")
+        metrics.incr("trace.bytes", len(record))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class TraceReader:
+    # Records are (kind, wall-clock ns, payload) where payload is a memoryview
+    # into the mapped file; nothing is copied or decoded until decode() is
+    # called, so kind filters and counts stay cheap over large traces. Views
+    # are only valid until the reader is closed.
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= len(MAGIC) else None
+        if self._mmap is None or self._mmap[:len(MAGIC)] != MAGIC:
+            raise RuntimeError(f"{path} is not a gauntlet trace")
+        self._view = memoryview(self._mmap)
+
+    @property
+    def run_id(self) -> str:
+        return os.path.basename(self.path)[:-len(SUFFIX)]
+
+    def records(self, kinds=None):
+        wanted = None if kinds is None else {KINDS[kind] for kind in kinds}
+        view, offset, end = self._view, len(MAGIC), len(self._view)
+        while offset + _HEADER.size <= end:
+            length, code, timestamp_ns = _HEADER.unpack_from(view, offset)
+            start = offset + _HEADER.size
+            if start + length > end:
+                break
+            offset = start + length
+            if wanted is None or code in wanted:
+                yield _NAMES.get(code, str(code)), timestamp_ns, view[start:offset]
+
+    def __iter__(self):
+        return self.records()
+
+    def calls(self):
+        for _, _, payload in self.records(("call",)):
+            yield decode(payload)
+
+    def events(self):
+        for _, timestamp_ns, payload in self.records(("event",)):
+            yield timestamp_ns, decode(payload)
+
+    def close(self):
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a caller still holds payload views; freed with them
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def decode(payload) -> dict:
+    return json.loads(bytes(payload))
+
+
+def _started(path: str) -> bool:
+    # A trace that was just created may not have its magic on disk yet.
+    try:
+        return os.path.getsize(path) >= len(MAGIC)
+    except OSError:
+        return False
+
+
+def iter_traces(directory: str = None):
+    for path in sorted(glob.glob(os.path.join(directory or config.TRACE_DIR, f"*{SUFFIX}"))):
+        if not _started(path):
+            continue
+        with TraceReader(path) as reader:
+            yield reader
+
+
+def scan_calls(directory: str = None):
+    for reader in iter_traces(directory):
+        for call in reader.calls():
+            call["run_id"] = reader.run_id
+            yield call
+
+
+def _paths(target: str) -> list:
+    if os.path.isdir(target):
+        return [path for path in sorted(glob.glob(os.path.join(target, f"*{SUFFIX}"))) if _started(path)]
+    return [target]
+
+
+def stat(target: str) -> dict:
+    kinds, tools, mutated, total_bytes = Counter(), Counter(), 0, 0
+    paths = _paths(target)
+    for path in paths:
+        total_bytes += os.path.getsize(path)
+        with TraceReader(path) as reader:
+            for kind, _, payload in reader:
+                kinds[kind] += 1
+                if kind == "call":
+                    call = decode(payload)
+                    tools[call["tool_name"]] += 1
+                    mutated += bool(call.get("mutated"))
+    return {"runs": len(paths), "bytes": total_bytes, "records": dict(kinds),
+            "calls_by_tool": dict(tools), "mutated_calls": mutated}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.trace")
+    parser.add_argument("command", choices=["stat", "dump"])
+    parser.add_argument("target", nargs="?", default=None,
+                        help="Trace file or directory (defaults to GAUNTLET_TRACE_DIR)")
+    args = parser.parse_args()
+
+    target = args.target or config.TRACE_DIR
+    if not target:
+        parser.error("pass a trace file or directory, or set GAUNTLET_TRACE_DIR")
+    if args.command == "stat":
+        print(json.dumps(stat(target), indent=2))
+        return
+    for path in _paths(target):
+        with TraceReader(path) as reader:
+            for kind, timestamp_ns, payload in reader:
+                print(json.dumps({"run_id": reader.run_id, "kind": kind, "timestamp_ns": timestamp_ns,
+                                  "payload": decode(payload)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import threading
+from collections import Counter
+
+from gauntlet.tiers import CHARS_PER_TOKEN
+
+SOURCES = ("mock_agent", "agent_under_test")
+
+
+class BudgetExceeded(RuntimeError):
+    pass
+
+
+def _field(obj, *names):
+    for name in names:
+        value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def usage_from_response(data: dict, message: str) -> dict:
+    # Agent Builder reports model_usage and steps; the openai backend returns
+    # the same shape. Anything that reports no counts is estimated from text
+    # length, like the tier metrics.
+    usage = data.get("model_usage") or data.get("usage") or {}
+    input_tokens = _field(usage, "input_tokens", "prompt_tokens")
+    output_tokens = _field(usage, "output_tokens", "completion_tokens")
+    estimated = input_tokens is None or output_tokens is None
+    if estimated:
+        reply = data.get("response", {}).get("message") or ""
+        input_tokens, output_tokens = len(message) // CHARS_PER_TOKEN, len(reply) // CHARS_PER_TOKEN
+    return {
+        "input_tokens": int(input_tokens),
+        "output_tokens": int(output_tokens),
+        "model": _field(usage, "model") or data.get("model") or "",
+        "llm_calls": int(_field(usage, "llm_calls", "requests") or 1),
+        "steps": len(data.get("steps") or ()),
+        "estimated": estimated,
+    }
+
+
+def usage_from_result(result):
+    # The agent under test's own run result, where its framework reports
+    # usage: openai-agents' RunResult (raw_responses[].usage), or anything
+    # with a usage attribute or key. None when there is nothing to read.
+    responses = getattr(result, "raw_responses", None)
+    usages = [r.usage for r in responses if getattr(r, "usage", None) is not None] if responses else []
+    if not usages:
+        usage = _field(result, "usage")
+        usages = [usage] if usage is not None else []
+    if not usages:
+        return None
+    input_tokens = sum(_field(u, "input_tokens", "prompt_tokens") or 0 for u in usages)
+    output_tokens = sum(_field(u, "output_tokens", "completion_tokens") or 0 for u in usages)
+    agent = getattr(result, "last_agent", None)
+    model = getattr(agent, "model", None)
+    return {
+        "input_tokens": int(input_tokens),
+        "output_tokens": int(output_tokens),
+        "model": model if isinstance(model, str) else _field(result, "model") or "",
+        "llm_calls": sum(int(_field(u, "requests", "llm_calls") or 1) for u in usages),
+        "steps": len(getattr(result, "new_items", None) or ()),
+        "estimated": False,
+    }
+
+
+def usage_cost(usage: dict, cost_per_1m: float) -> float:
+    return (usage["input_tokens"] + usage["output_tokens"]) / 1e6 * cost_per_1m
+
+
+class Ledger:
+    # Running token and cost totals, per source and per model, against an
+    # optional USD budget. One per run and one per campaign.
+    def __init__(self, budget_usd: float = None):
+        self.budget_usd = budget_usd
+        self._lock = threading.Lock()
+        self._totals = {source: Counter() for source in SOURCES}
+        self.models = Counter()
+
+    def add(self, usage: dict, cost: float, source: str = "mock_agent") -> bool:
+        # True when this addition is the one that spends the budget.
+        with self._lock:
+            was_exceeded = self._exceeded()
+            totals = self._totals[source]
+            for key in ("input_tokens", "output_tokens", "llm_calls", "steps"):
+                totals[key] += usage[key]
+            totals["cost_usd"] += cost
+            totals["estimated_calls"] += usage["estimated"]
+            if usage["model"]:
+                self.models[usage["model"]] += usage["llm_calls"]
+            return not was_exceeded and self._exceeded()
+
+    def _total(self, key: str):
+        return sum(totals[key] for totals in self._totals.values())
+
+    @property
+    def tokens(self) -> int:
+        return self._total("input_tokens") + self._total("output_tokens")
+
+    @property
+    def cost_usd(self) -> float:
+        return self._total("cost_usd")
+
+    def source_tokens(self, source: str) -> int:
+        with self._lock:
+            return self._totals[source]["input_tokens"] + self._totals[source]["output_tokens"]
+
+    def _exceeded(self) -> bool:
+        return self.budget_usd is not None and self.cost_usd >= self.budget_usd
+
+    def exceeded(self) -> bool:
+        with self._lock:
+            return self._exceeded()
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "input_tokens": self._total("input_tokens"),
+                "output_tokens": self._total("output_tokens"),
+                "tokens": self.tokens,
+                "cost_usd": self.cost_usd,
+                "llm_calls": self._total("llm_calls"),
+                "steps": self._total("steps"),
+                "models": sorted(self.models),
+                "budget_usd": self.budget_usd,
+                "by_source": {source: dict(totals) for source, totals in self._totals.items() if totals},
+            }
@@ -0,0 +1,42 @@
+import json
+import typing
+
+from gauntlet.encoding import dumps
+
+SIMULATED_MARKER = "simulated side effect"
+
+
+def _fill(shape, call_args: dict):
+    if isinstance(shape, dict):
+        return {key: call_args.get(key, value) for key, value in shape.items()}
+    if isinstance(shape, list):
+        return [_fill(shape[0], call_args)] if shape else []
+    return shape
+
+
+def synthesize(templates: list, call_args: dict) -> str:
+    # Reuse the shape of a real success result, with fields that match
+    # call arguments taking the values the agent asked for.
+    for template in templates:
+        try:
+            shape = json.loads(template)
+        except (TypeError, json.JSONDecodeError):
+            continue
+        if isinstance(shape, dict) and "error" in shape:
+            continue
+        return dumps(_fill(shape, call_args))
+    return dumps({**call_args, "status": "ok"})
+
+
+def as_return_type(fn, result: str):
+    # Hand back what the real tool would: parsed JSON when it is annotated to
+    # return a dict or list, the JSON text otherwise.
+    try:
+        annotation = typing.get_type_hints(fn).get("return")
+    except (NameError, TypeError):
+        annotation = None
+    wanted = typing.get_origin(annotation) or annotation
+    if wanted not in (dict, list):
+        return result
+    value = json.loads(result)
+    return value if isinstance(value, wanted) else result
@@ -0,0 +1,330 @@
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+
+import requests
+
+from gauntlet.bulk import bulk_write
+from gauntlet.config import config
+from gauntlet.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: the directory lock is unavailable
+    fcntl = None
+
+FSYNC_POLICIES = ("always", "interval", "never")
+SHIP_BATCH = 500
+MAX_BACKOFF = 30.0
+
+
+def _encode(record: dict) -> bytes:
+    payload = json.dumps(record, separators=(",", ":"))
+    return f"{zlib.crc32(payload.encode()):08x} {payload}\n".encode()
+
+
+def _decode(line: bytes):
+    crc, _, payload = line.rstrip(b"\n").partition(b" ")
+    try:
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _truncate_torn_tail(path: str, chunk: int = 64 << 10):
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            f.truncate(position)
+            metrics.incr("wal.torn_bytes", end - position)
+            print(f"  [gauntlet] Dropped a torn {end - position}-byte record from {path}")
+
+
+class WriteAheadLog:
+    # One writer per directory: the log holds an exclusive lock on wal.lock
+    # while open. read_only opens skip the lock and never write, for
+    # inspecting a directory a running process owns.
+    def __init__(self, directory: str, segment_bytes: int = 8 << 20, max_bytes: int = 512 << 20,
+                 fsync: str = "interval", fsync_interval: float = 1.0, read_only: bool = False):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._ship_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_fsync = 0.0
+        self._shipper = None
+        self._lock_file = None
+        self._active = None
+        os.makedirs(directory, exist_ok=True)
+        if read_only:
+            return
+        self._lock_file = self._lock_directory()
+
+        segments = self.segments()
+        self._seq = segments[-1] if segments else 0
+        # A crash can leave a torn record at the end of the last segment; cut
+        # it off so the next append starts on a fresh line.
+        _truncate_torn_tail(self._segment_path(self._seq))
+        self._active = open(self._segment_path(self._seq), "ab")
+
+    def _lock_directory(self):
+        if fcntl is None:
+            return None
+        f = open(os.path.join(self.directory, "wal.lock"), "a+")
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.seek(0)
+            owner = f.read().strip() or "unknown"
+            f.close()
+            raise RuntimeError(f"WAL directory {self.directory} is in use by process {owner}; "
+                               "give each process its own GAUNTLET_WAL_DIR")
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        return f
+
+    def close(self):
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+    # ── segments and checkpoint ──────────────────────────────────────────
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"wal-{seq:010d}.log")
+
+    def segments(self) -> list:
+        return sorted(int(name[4:14]) for name in os.listdir(self.directory)
+                      if name.startswith("wal-") and name.endswith(".log"))
+
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.directory, "checkpoint.json")
+
+    def checkpoint(self) -> tuple:
+        try:
+            with open(self._checkpoint_path()) as f:
+                data = json.load(f)
+            return data["segment"], data["offset"]
+        except (OSError, ValueError, KeyError):
+            segments = self.segments()
+            return (segments[0] if segments else 0), 0
+
+    def _save_checkpoint(self, seq: int, offset: int):
+        tmp = self._checkpoint_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segment": seq, "offset": offset}, f)
+        os.replace(tmp, self._checkpoint_path())
+
+    def disk_bytes(self) -> int:
+        return sum(os.path.getsize(self._segment_path(seq)) for seq in self.segments())
+
+    # ── writing ──────────────────────────────────────────────────────────
+
+    def append(self, index: str, doc: dict, doc_id: str = None):
+        # Every record carries an id so replaying a batch after a partial
+        # failure overwrites instead of duplicating documents.
+        record = {"index": index, "id": doc_id or str(uuid.uuid4()), "doc": doc}
+        data = _encode(record)
+        with self._lock:
+            if self._active.tell() + len(data) > self.segment_bytes and self._active.tell() > 0:
+                self._rotate()
+            self._active.write(data)
+            self._active.flush()
+            now = time.monotonic()
+            if self.fsync == "always" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._active.fileno())
+                self._last_fsync = now
+        metrics.incr("wal.appended")
+        self._wake.set()
+
+    def _rotate(self):
+        os.fsync(self._active.fileno())
+        self._active.close()
+        self._seq += 1
+        self._active = open(self._segment_path(self._seq), "ab")
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        segments = self.segments()
+        total = sum(os.path.getsize(self._segment_path(seq)) for seq in segments)
+        cp_seq, _ = self.checkpoint()
+        for seq in segments[:-1]:
+            if total <= self.max_bytes:
+                break
+            size = os.path.getsize(self._segment_path(seq))
+            os.remove(self._segment_path(seq))
+            total -= size
+            if seq >= cp_seq:
+                metrics.incr("wal.dropped_bytes", size)
+                print(f"  [gauntlet] WAL over {self.max_bytes} bytes, dropped unshipped segment {seq}")
+                self._save_checkpoint(seq + 1, 0)
+                cp_seq = seq + 1
+
+    # ── reading and shipping ─────────────────────────────────────────────
+
+    def records(self):
+        # Yields (record, (segment, offset just past it)) from the checkpoint
+        # on, reading one line at a time.
+        seq, offset = self.checkpoint()
+        for segment in self.segments():
+            if segment < seq:
+                continue
+            try:
+                f = open(self._segment_path(segment), "rb")
+            except FileNotFoundError:
+                continue  # dropped by the disk budget
+            with f:
+                f.seek(offset if segment == seq else 0)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn tail of the active segment
+                    record = _decode(line)
+                    if record is None:
+                        metrics.incr("wal.corrupt_records")
+                    else:
+                        yield record, (segment, f.tell())
+
+    def pending(self, limit: int = None):
+        records, position = [], None
+        for record, position in self.records():
+            records.append(record)
+            if limit and len(records) >= limit:
+                break
+        return records, position
+
+    def ship_once(self) -> int:
+        with self._ship_lock:
+            return self._ship_batch()
+
+    def _ship_batch(self) -> int:
+        with self._lock:
+            self._active.flush()
+        records, position = self.pending(SHIP_BATCH)
+        if not records:
+            return 0
+        started = time.monotonic()
+        result = bulk_write(records)
+        if result["retryable"]:
+            raise requests.HTTPError(f"{result['retryable']} retryable bulk item failures")
+        metrics.observe("es.write_ms", (time.monotonic() - started) * 1000)
+        metrics.incr("wal.shipped", len(records))
+        self._save_checkpoint(*position)
+        for seq in self.segments():
+            if seq < position[0] and seq != self._seq:
+                os.remove(self._segment_path(seq))
+        return len(records)
+
+    def drain(self) -> int:
+        shipped = 0
+        while True:
+            count = self.ship_once()
+            if not count:
+                return shipped
+            shipped += count
+
+    def _ship_forever(self):
+        backoff = 1.0
+        while True:
+            self._wake.wait(timeout=5.0)
+            self._wake.clear()
+            try:
+                while self.ship_once():
+                    pass
+                backoff = 1.0
+            except requests.RequestException as e:
+                metrics.incr("wal.ship_failures")
+                print(f"  [gauntlet] WAL shipping failed, retrying in {backoff:.0f}s: {e}")
+                time.sleep(backoff)
+                backoff = min(MAX_BACKOFF, backoff * 2)
+                self._wake.set()
+
+    def start(self):
+        if self._shipper is None:
+            self._shipper = threading.Thread(target=self._ship_forever, name="gauntlet-wal", daemon=True)
+            self._shipper.start()
+        return self
+
+    def stat(self) -> dict:
+        seq, offset = self.checkpoint()
+        return {
+            "directory": self.directory,
+            "segments": len(self.segments()),
+            "disk_bytes": self.disk_bytes(),
+            "pending_records": sum(1 for _ in self.records()),
+            "checkpoint": {"segment": seq, "offset": offset},
+        }
+
+
+_wal = None
+_wal_lock = threading.Lock()
+
+
+def get_wal() -> WriteAheadLog:
+    global _wal
+    with _wal_lock:
+        if _wal is None:
+            _wal = WriteAheadLog(
+                config.WAL_DIR,
+                max_bytes=config.WAL_MAX_BYTES,
+                fsync=config.WAL_FSYNC,
+            ).start()
+            atexit.register(_drain_at_exit)
+        return _wal
+
+
+def _drain_at_exit():
+    try:
+        _wal.drain()
+    except requests.RequestException:
+        print(f"  [gauntlet] Elasticsearch unavailable, WAL will replay from {_wal.directory} on restart")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m gauntlet.wal")
+    parser.add_argument("command", choices=["stat", "dump", "drain"])
+    parser.add_argument("--dir", default=None, help="WAL directory (defaults to GAUNTLET_WAL_DIR)")
+    args = parser.parse_args()
+
+    # stat and dump only read, so they work while a run owns the directory.
+    wal = WriteAheadLog(args.dir or config.WAL_DIR, read_only=args.command != "drain")
+    if args.command == "stat":
+        print(json.dumps(wal.stat(), indent=2))
+    elif args.command == "dump":
+        for record, _ in wal.records():
+            print(json.dumps(record))
+    else:
+        print(f"Shipped {wal.drain()} records")
+        wal.close()
+
+
+if __name__ == "__main__":
+    main()
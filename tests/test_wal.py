@@ -0,0 +1,41 @@
+import pytest
+
+from gauntlet.wal import WriteAheadLog
+
+
+def test_append_after_torn_write_survives_restart(tmp_path):
+    wal = WriteAheadLog(str(tmp_path), fsync="never")
+    wal.append("idx", {"n": 1}, "d1")
+    wal._active.write(b'0badc0de {"index":"idx","id":"d2","doc":{"n"')  # crash mid-record
+    wal.close()
+
+    wal = WriteAheadLog(str(tmp_path), fsync="never")
+    wal.append("idx", {"n": 3}, "d3")
+    wal._active.flush()
+
+    records, _ = wal.pending()
+    assert [record["id"] for record in records] == ["d1", "d3"]
+
+
+def test_torn_record_with_no_complete_line_is_dropped(tmp_path):
+    wal = WriteAheadLog(str(tmp_path), fsync="never")
+    wal._active.write(b'0badc0de {"index"')
+    wal.close()
+
+    wal = WriteAheadLog(str(tmp_path), fsync="never")
+    wal.append("idx", {"n": 1}, "d1")
+    wal._active.flush()
+
+    records, _ = wal.pending()
+    assert [record["id"] for record in records] == ["d1"]
+
+
+def test_second_writer_on_the_same_directory_is_refused(tmp_path):
+    wal = WriteAheadLog(str(tmp_path), fsync="never")
+    wal.append("idx", {"n": 1}, "d1")
+    with pytest.raises(RuntimeError, match="in use"):
+        WriteAheadLog(str(tmp_path), fsync="never")
+
+    reader = WriteAheadLog(str(tmp_path), read_only=True)
+    assert reader.stat()["pending_records"] == 1
+    wal.close()